@@ -0,0 +1,195 @@
+"""Performance benchmarks for dim_dca kernels, fitting, comparison and uncertainty.
+
+Usage:
+    python benchmarks/bench.py --quick --save benchmarks/results/current.json
+    python benchmarks/bench.py --compare benchmarks/results/baseline.json --tolerance 0.25
+
+Each case is timed `--repeats` times (after one warm-up call) and the minimum and
+median wall times are stored as JSON. With `--compare`, cases slower than the
+baseline minimum by more than `--tolerance` are reported and the exit code is 1.
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+
+from dim_dca.batch import fit_many
+from dim_dca.compare import compare_models
+from dim_dca.fit import FitOptions, fit_model
+from dim_dca.models import CUM_FUNCS, RATE_FUNCS
+from dim_dca.simulate import simulate
+from dim_dca.uncertainty import bootstrap_params, random_walk_mcmc
+from dim_dca.validation import cv_rmse
+
+PARAMS = {
+    "arps_exp": {"qi": 1000.0, "di": 0.1},
+    "arps_harm": {"qi": 1000.0, "di": 0.1},
+    "arps_hyp": {"qi": 1000.0, "di": 0.1, "b": 0.7},
+    "stretched_exp": {"qi": 1000.0, "tau": 10.0, "n": 0.8},
+    "duong": {"q1": 1000.0, "a": -0.2, "m": 0.5},
+    "gompertz": {"qmax": 20000.0, "alpha": 3.0, "beta": 0.1},
+    "logistic": {"qmax": 20000.0, "k": 0.1, "t0": 10.0},
+}
+INITIALS = {
+    "arps_exp": {"qi": 900.0, "di": 0.2},
+    "arps_harm": {"qi": 900.0, "di": 0.2},
+    "arps_hyp": {"qi": 900.0, "di": 0.2, "b": 0.5},
+    "stretched_exp": {"qi": 900.0, "tau": 8.0, "n": 0.7},
+    "duong": {"q1": 900.0, "a": -0.1, "m": 0.6},
+    "gompertz": {"qmax": 15000.0, "alpha": 2.0, "beta": 0.15},
+    "logistic": {"qmax": 15000.0, "k": 0.15, "t0": 8.0},
+}
+LENGTHS = (50, 1_000, 100_000)
+WELL_COUNTS = (1, 100, 10_000)
+QUICK_LENGTHS = (50, 1_000)
+QUICK_WELL_COUNTS = (1, 100)
+
+Case = tuple[str, Callable[[], object]]
+
+
+def _series(n: int, model: str = "arps_hyp") -> tuple[np.ndarray, np.ndarray]:
+    t = np.linspace(0.0, 60.0, n)
+    return t, simulate(model, t, PARAMS[model], noise="gaussian", sigma=2.0, seed=0)
+
+
+def kernel_cases(lengths: tuple[int, ...]) -> list[Case]:
+    cases: list[Case] = []
+    for n in lengths:
+        t = np.linspace(0.0, 60.0, n)
+        for model, p in PARAMS.items():
+            cases.append((f"kernel.rate.{model}.n{n}", lambda f=RATE_FUNCS[model], t=t, p=p: f(t, p)))
+            cases.append((f"kernel.cum.{model}.n{n}", lambda f=CUM_FUNCS[model], t=t, p=p: f(t, p)))
+    return cases
+
+
+def fit_cases(lengths: tuple[int, ...]) -> list[Case]:
+    cases: list[Case] = []
+    for n in lengths:
+        t, q = _series(n)
+        init = INITIALS["arps_hyp"]
+        cases.append((f"fit_model.local.n{n}", lambda t=t, q=q: fit_model("arps_hyp", t, q, init, FitOptions())))
+        cases.append(
+            (f"fit_model.global.n{n}", lambda t=t, q=q: fit_model("arps_hyp", t, q, init, FitOptions(global_search=True)))
+        )
+    return cases
+
+
+@cache
+def _base_params(n: int) -> dict[str, float]:
+    """Fitted parameters the uncertainty cases start from; computed by the first (warm-up) call."""
+    t, q = _series(n)
+    return fit_model("arps_hyp", t, q, INITIALS["arps_hyp"]).params
+
+
+def workflow_cases(lengths: tuple[int, ...]) -> list[Case]:
+    cases: list[Case] = []
+    for n in lengths:
+        t, q = _series(n)
+        cases.append((f"compare_models.n{n}", lambda t=t, q=q: compare_models(list(INITIALS), t, q, INITIALS)))
+        cases.append((f"cv_rmse.n{n}", lambda t=t, q=q: cv_rmse("arps_hyp", t, q, INITIALS["arps_hyp"])))
+        cases.append(
+            (
+                f"bootstrap_params.n{n}",
+                lambda t=t, q=q, n=n: bootstrap_params("arps_hyp", t, q, _base_params(n), n_boot=20),
+            )
+        )
+        cases.append(
+            (
+                f"random_walk_mcmc.n{n}",
+                lambda t=t, q=q, n=n: random_walk_mcmc("arps_hyp", t, q, _base_params(n), sigma=2.0, n_samples=500),
+            )
+        )
+    return cases
+
+
+def well_cases(well_counts: tuple[int, ...]) -> list[Case]:
+    cases: list[Case] = []
+    t, _ = _series(50)
+    for n_wells in well_counts:
+        rng = np.random.default_rng(n_wells)
+        qi = rng.uniform(500.0, 1500.0, n_wells)[:, None]
+        di = rng.uniform(0.05, 0.3, n_wells)[:, None]
+        q = qi / (1.0 + 0.7 * di * t) ** (1.0 / 0.7) + rng.normal(0.0, 2.0, (n_wells, t.size))
+        wells = (np.repeat(np.arange(n_wells), t.size), np.tile(t, n_wells), q.ravel())
+        cases.append((f"fit_many.wells{n_wells}", lambda w=wells: fit_many("arps_hyp", w, INITIALS["arps_hyp"])))
+    return cases
+
+
+def time_case(fn: Callable[[], object], repeats: int) -> dict[str, float]:
+    fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "repeats": repeats}
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, res in sorted(current["results"].items()):
+        ref = baseline["results"].get(name)
+        if ref is None:
+            continue
+        ratio = res["min"] / max(ref["min"], 1e-12)
+        flag = "REGRESSION" if ratio > 1.0 + tolerance else ""
+        print(f"{name:50s} {ref['min'] * 1e3:10.3f} ms -> {res['min'] * 1e3:10.3f} ms  x{ratio:5.2f} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run dim_dca performance benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Skip the 10^5-point series and 10^4-well cases")
+    parser.add_argument("--filter", default="*", help="fnmatch pattern on case names")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--save", type=Path, help="Write results JSON here")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    lengths = QUICK_LENGTHS if args.quick else LENGTHS
+    well_counts = QUICK_WELL_COUNTS if args.quick else WELL_COUNTS
+    cases = kernel_cases(lengths) + fit_cases(lengths) + workflow_cases(lengths) + well_cases(well_counts)
+
+    results = {}
+    for name, fn in cases:
+        if not fnmatch.fnmatch(name, args.filter):
+            continue
+        results[name] = time_case(fn, args.repeats)
+        print(f"{name:50s} {results[name]['min'] * 1e3:10.3f} ms", flush=True)
+
+    current = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,43 @@
-from .compare import compare_models
-from .diagnostics import residual_diagnostics
-from .fit import FitOptions, fit_bayesian_map, fit_model
-from .simulate import simulate
-
-__all__ = [
-    "FitOptions",
-    "fit_model",
-    "fit_bayesian_map",
-    "simulate",
-    "residual_diagnostics",
-    "compare_models",
-]
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .batch import fit_many
+    from .compare import compare_models
+    from .diagnostics import residual_diagnostics
+    from .fit import FitOptions, fit_bayesian_map, fit_model, update_fit
+    from .joint import fit_joint
+    from .service import FitService
+    from .simulate import simulate
+    from .table import FitTable
+
+# Public names resolve on first access (PEP 562) so `import dim_dca` stays cheap.
+_EXPORTS = {
+    "FitOptions": "fit",
+    "fit_model": "fit",
+    "fit_bayesian_map": "fit",
+    "fit_many": "batch",
+    "fit_joint": "joint",
+    "update_fit": "fit",
+    "FitTable": "table",
+    "simulate": "simulate",
+    "residual_diagnostics": "diagnostics",
+    "compare_models": "compare",
+    "FitService": "service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
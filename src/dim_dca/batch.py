@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+
+import numpy as np
+
+from .fit import FitOptions, _covariance, _information_criteria, _loss, _pack, _solve
+from .initialize import initial_guess
+from .instrument import stage
+from .models import JAC_KERNELS, MODEL_SPECS, RATE_KERNELS
+from .table import FitTable, fit_flags, pack_covariance, packed_size
+from .types import Array
+
+WellSeries = tuple[object, Array, Array]
+Wells = tuple[Array, Array, Array] | Mapping[object, tuple[Array, Array]] | Iterable[WellSeries]
+
+
+def well_segments(well_ids: Array) -> tuple[Array, Array, Array]:
+    """Stable grouping of a long-format id column into (ids, order, bounds)."""
+    well_ids = np.asarray(well_ids)
+    order = np.argsort(well_ids, kind="stable")
+    sorted_ids = well_ids[order]
+    change = np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1
+    bounds = np.concatenate(([0], change, [len(sorted_ids)]))
+    ids = sorted_ids[bounds[:-1]] if len(sorted_ids) else sorted_ids
+    return ids, order, bounds
+
+
+def iter_wells(wells: Wells) -> Iterator[WellSeries]:
+    if isinstance(wells, tuple) and len(wells) == 3 and isinstance(wells[0], np.ndarray):
+        well_ids, t, q = (np.asarray(a) for a in wells)
+        ids, order, bounds = well_segments(well_ids)
+        t, q = np.asarray(t, dtype=float)[order], np.asarray(q, dtype=float)[order]
+        for i, wid in enumerate(ids):
+            yield wid, t[bounds[i] : bounds[i + 1]], q[bounds[i] : bounds[i + 1]]
+        return
+    items = ((wid, t, q) for wid, (t, q) in wells.items()) if isinstance(wells, Mapping) else wells
+    for wid, t, q in items:
+        yield wid, np.asarray(t, dtype=float), np.asarray(q, dtype=float)
+
+
+def stack_wells(wells: Wells) -> tuple[Array, Array, Array, Array]:
+    """Concatenate wells into (ids, t, q, bounds), well i occupying rows [bounds[i], bounds[i + 1])."""
+    if isinstance(wells, tuple) and len(wells) == 3 and isinstance(wells[0], np.ndarray):
+        ids, order, bounds = well_segments(wells[0])
+        return ids, np.asarray(wells[1], dtype=float)[order], np.asarray(wells[2], dtype=float)[order], bounds
+    ids, ts, qs = [], [], []
+    for wid, t, q in iter_wells(wells):
+        ids.append(wid)
+        ts.append(t)
+        qs.append(q)
+    bounds = np.concatenate(([0], np.cumsum([len(t) for t in ts], dtype=np.int64)))
+    id_arr = np.empty(len(ids), dtype=object)
+    id_arr[:] = ids
+    if not ts:
+        return id_arr, np.empty(0), np.empty(0), bounds
+    return id_arr, np.concatenate(ts), np.concatenate(qs), bounds
+
+
+def fit_many(
+    model: str,
+    wells: Wells,
+    initial: dict[str, float] | Array | None = None,
+    options: FitOptions | None = None,
+) -> FitTable:
+    """Fit one model to every well; `initial` is shared, an (n_wells, k) array, or None for per-well guesses."""
+    options = options or FitOptions()
+    spec = MODEL_SPECS[model]
+    rate_fn = RATE_KERNELS[model]
+    jac_fn = JAC_KERNELS[model]
+    order = spec.param_order
+    k = len(order)
+    lb, ub = np.array(spec.bounds[0]), np.array(spec.bounds[1])
+    shared = _pack(initial, order) if isinstance(initial, Mapping) else None
+    per_well = None if shared is not None or initial is None else np.asarray(initial, dtype=float)
+
+    ids: list[object] = []
+    params: list[Array] = []
+    success: list[bool] = []
+    loss: list[float] = []
+    aic: list[float] = []
+    bic: list[float] = []
+    n_obs: list[int] = []
+    nfev: list[int] = []
+    flags: list[int] = []
+    cov: list[Array] = []
+    with stage("batch.fit_many") as st:
+        for i, (wid, t, q) in enumerate(iter_wells(wells)):
+            ids.append(wid)
+            n = len(q)
+            n_obs.append(n)
+            if n == 0:
+                params.append(np.full(k, np.nan))
+                success.append(False)
+                loss.append(np.nan)
+                aic.append(np.nan)
+                bic.append(np.nan)
+                nfev.append(0)
+                flags.append(0)
+                cov.append(np.full(packed_size(k), np.nan))
+                continue
+            if shared is not None:
+                theta0 = shared
+            elif per_well is not None:
+                theta0 = per_well[i]
+            else:
+                theta0 = _pack(initial_guess(model, t, q), order)
+            result, qp, stats = _solve(rate_fn, jac_fn, lb, ub, t, q, theta0, options)
+            rss = float(np.sum((q - qp) ** 2))
+            a, b = _information_criteria(rss, n, k)
+            c = _covariance(result.jac, rss, n)
+            params.append(result.x)
+            success.append(bool(result.success))
+            loss.append(_loss(q, qp, options))
+            aic.append(a)
+            bic.append(b)
+            nfev.append(stats.nfev)
+            flags.append(fit_flags(model, result.x, c, options.global_search))
+            cov.append(pack_covariance(c) if c is not None else np.full(packed_size(k), np.nan))
+        st.counters["wells"] = len(ids)
+
+    m = len(ids)
+    well_id = np.empty(m, dtype=object)
+    well_id[:] = ids
+    return FitTable(
+        well_id=well_id,
+        model=np.full(m, model, dtype=object),
+        objective=np.full(m, options.objective, dtype=object),
+        params=np.array(params, dtype=float).reshape(m, k),
+        n_params=np.full(m, k, dtype=np.int8),
+        success=np.array(success, dtype=bool),
+        loss=np.array(loss, dtype=float),
+        aic=np.array(aic, dtype=float),
+        bic=np.array(bic, dtype=float),
+        n_obs=np.array(n_obs, dtype=np.int64),
+        nfev=np.array(nfev, dtype=np.int32),
+        flags=np.array(flags, dtype=np.uint8),
+        covariance=np.array(cov, dtype=float).reshape(m, packed_size(k)),
+    )
+
+
+def batched_least_squares(
+    model: str,
+    t: Array,
+    y: Array,
+    theta0: Array,
+    max_iter: int = 100,
+    xtol: float = 1e-8,
+    ftol: float = 1e-10,
+) -> tuple[Array, Array]:
+    """Levenberg-Marquardt on many responses `y` (m, n) sharing one time grid `t`.
+
+    All rows advance together through batched kernel, Jacobian and (k, k) solve
+    calls; steps are projected onto the model bounds. Returns (theta, success);
+    rows stopped by a damping blow-up rather than a step or cost test are failures.
+    """
+    spec = MODEL_SPECS[model]
+    rate_fn = RATE_KERNELS[model]
+    jac_fn = JAC_KERNELS[model]
+    lb, ub = np.array(spec.bounds[0]), np.array(spec.bounds[1])
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    m, k = y.shape[0], len(spec.param_order)
+
+    theta = np.array(np.broadcast_to(theta0, (m, k)), dtype=float)
+    r = y - rate_fn(t, theta)
+    cost = 0.5 * np.einsum("ij,ij->i", r, r)
+    lam = np.full(m, 1e-3)
+    active = np.isfinite(cost)
+    success = np.zeros(m, dtype=bool)
+    eye = np.eye(k)
+    with stage("batch.least_squares") as st, np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        st.counters.update(problems=m, nfev=0, njev=0)
+        for _ in range(max_iter):
+            idx = np.flatnonzero(active)
+            if idx.size == 0:
+                break
+            st.counters["nfev"] += idx.size
+            st.counters["njev"] += idx.size
+            jac = jac_fn(t, theta[idx])
+            jtj = np.einsum("anj,ank->ajk", jac, jac)
+            g = np.einsum("anj,an->aj", jac, r[idx])
+            d = np.diagonal(jtj, axis1=1, axis2=2)
+            d = np.maximum(d, 1e-12 * np.max(d, axis=1, keepdims=True) + 1e-300)
+            a = jtj + lam[idx, None, None] * d[:, :, None] * eye
+            step = np.linalg.solve(a, g[..., None])[..., 0]
+            cand = np.clip(theta[idx] + step, lb, ub)
+            r_c = y[idx] - rate_fn(t, cand)
+            cost_c = 0.5 * np.einsum("ij,ij->i", r_c, r_c)
+            better = np.isfinite(cost_c) & (cost_c <= cost[idx])
+
+            moved = np.abs(cand - theta[idx])
+            small_step = np.all(moved <= xtol * (np.abs(theta[idx]) + xtol), axis=1)
+            small_gain = cost[idx] - cost_c <= ftol * cost[idx]
+            acc = idx[better]
+            theta[acc] = cand[better]
+            r[acc] = r_c[better]
+            cost[acc] = cost_c[better]
+            lam[acc] *= 0.3
+            lam[idx[~better]] *= 10.0
+
+            converged = better & (small_step | small_gain)
+            stalled = lam[idx] > 1e12
+            success[idx[converged]] = True
+            active[idx[converged | stalled]] = False
+    return theta, success & np.isfinite(cost)
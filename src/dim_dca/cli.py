@@ -2,59 +2,144 @@ from __future__ import annotations
 
 import argparse
 import json
+from contextlib import nullcontext
+from dataclasses import fields
+from functools import cache
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from .compare import compare_models
 from .data import generate_synthetic_dataset, save_dataset_csv
 from .exploratory import run_exploratory_suite
-from .fit import FitOptions, fit_model
-from .models import RATE_FUNCS
+from .fit import fit_model
+from .instrument import Recorder, profile
+from .models import MODEL_SPECS, RATE_FUNCS
+from .runner import WELL_COMMANDS, WellJob, json_default, run_field
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Run end-to-end DCA pipeline")
-    parser.add_argument("--out", default="artifacts", help="Output directory")
-    args = parser.parse_args()
+@cache
+def _pyplot():
+    """pyplot on the headless Agg backend, selected once on first use."""
+    import matplotlib
 
-    out = Path(args.out)
-    out.mkdir(parents=True, exist_ok=True)
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def plot_fit(path: Path, t: np.ndarray, q: np.ndarray, qhat: np.ndarray, label: str) -> None:
+    plt = _pyplot()
+    fig = plt.figure(figsize=(8, 4))
+    plt.scatter(t, q, s=10, label="Observed")
+    plt.plot(t, qhat, color="red", lw=2, label=label)
+    plt.xlabel("Time")
+    plt.ylabel("Rate")
+    plt.legend()
+    plt.tight_layout()
+    fig.savefig(path, dpi=140)
+    plt.close(fig)
 
+
+def run_pipeline(out: Path, plot: bool = True) -> None:
     t, q, _ = generate_synthetic_dataset()
     save_dataset_csv(out / "synthetic.csv", t, q)
 
-    initials = {
-        "arps_exp": {"qi": float(np.max(q)), "di": 0.1},
-        "arps_harm": {"qi": float(np.max(q)), "di": 0.1},
-        "arps_hyp": {"qi": float(np.max(q)), "di": 0.1, "b": 0.7},
-        "stretched_exp": {"qi": float(np.max(q)), "tau": 10.0, "n": 0.8},
-        "duong": {"q1": float(np.max(q)), "a": -0.2, "m": 0.5},
-        "gompertz": {"qmax": np.trapz(q, t), "alpha": 3.0, "beta": 0.1},
-        "logistic": {"qmax": np.trapz(q, t), "k": 0.1, "t0": 10.0},
-    }
-
-    rows = compare_models(list(initials.keys()), t, q, initials)
+    rows = compare_models(list(MODEL_SPECS), t, q)
     with (out / "model_comparison.json").open("w", encoding="utf-8") as f:
-        json.dump(rows, f, indent=2)
+        json.dump(rows, f, indent=2, default=json_default)
 
     best = rows[0]["model"]
-    fit = fit_model(best, t, q, initials[best], FitOptions(global_search=True))
+    fit = fit_model(best, t, q)
     qhat = RATE_FUNCS[best](t, fit.params)
 
     expl = run_exploratory_suite(t, q, di=fit.params.get("di", 0.1), qi=fit.params.get("qi", float(np.max(q))))
     with (out / "exploratory.json").open("w", encoding="utf-8") as f:
         json.dump([e.__dict__ for e in expl], f, indent=2)
 
-    plt.figure(figsize=(8, 4))
-    plt.scatter(t, q, s=10, label="Observed")
-    plt.plot(t, qhat, color="red", lw=2, label=f"Best fit: {best}")
-    plt.xlabel("Time")
-    plt.ylabel("Rate")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(out / "fit.png", dpi=140)
+    if plot:
+        plot_fit(out / "fit.png", t, q, qhat, f"Best fit: {best}")
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+def _add_field_parser(sub: argparse._SubParsersAction, command: str, description: str) -> argparse.ArgumentParser:
+    p = sub.add_parser(command, help=description)
+    p.add_argument("input", help="Long-format production file (.csv, .parquet or .npy), grouped by well")
+    p.add_argument("-o", "--output", required=True, help="Output .jsonl file or .parquet directory; existing wells are skipped")
+    p.add_argument("--jobs", type=int, default=1, help="Worker processes")
+    p.add_argument("--chunksize", type=int, default=100_000, help="Input rows read per chunk")
+    p.add_argument("--well-col", default="well_id")
+    p.add_argument("--time-col", default="time")
+    p.add_argument("--rate-col", default="rate")
+    if command == "compare":
+        p.add_argument("--models", nargs="+", choices=list(MODEL_SPECS), default=list(MODEL_SPECS))
+        p.add_argument(
+            "--screen",
+            type=_positive_int,
+            default=None,
+            help="Fully fit and cross-validate only the best N models after successive-halving screening",
+        )
+    else:
+        p.add_argument("--model", choices=list(MODEL_SPECS), default="arps_hyp")
+    if command in ("forecast", "uncertainty"):
+        p.add_argument("--horizon", type=float, default=360.0, help="Forecast end time, in the file's time units")
+        p.add_argument("--q-limit", type=float, default=0.0, help="Economic limit rate")
+    if command == "uncertainty":
+        p.add_argument("--n-boot", type=int, default=200)
+        p.add_argument("--method", choices=["residual", "wild", "pairs"], default="residual")
+        p.add_argument("--alpha", type=float, default=0.1)
+    return p
+
+
+def _job(args: argparse.Namespace) -> WellJob:
+    names = {f.name for f in fields(WellJob)}
+    kwargs = {k: v for k, v in vars(args).items() if k in names}
+    if "models" in kwargs:
+        kwargs["models"] = tuple(kwargs["models"])
+    return WellJob(**kwargs)
+
+
+def _write_profile(recorder: Recorder | None, path: Path) -> None:
+    if recorder is not None:
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(recorder.summary(), f, indent=2)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Decline curve analysis: demo pipeline or per-well field runs")
+    parser.add_argument("--out", default="artifacts", help="Demo output directory")
+    parser.add_argument("--no-plot", action="store_true", help="Skip the fit plot (matplotlib is never imported)")
+    parser.add_argument("--profile", action="store_true", help="Write per-stage timings and counters to profile.json (next to -o for field runs; stages run in --jobs workers are not included)")
+    sub = parser.add_subparsers(dest="command")
+    _add_field_parser(sub, "fit", "Fit one model to every well")
+    _add_field_parser(sub, "compare", "Rank models for every well")
+    _add_field_parser(sub, "forecast", "Fit and forecast EUR / time to limit for every well")
+    _add_field_parser(sub, "uncertainty", "Bootstrap parameter intervals and EUR P10/P50/P90 for every well")
+    args = parser.parse_args(argv)
+
+    if args.command in WELL_COMMANDS:
+        if args.no_plot:
+            parser.error("--no-plot only applies to the demo pipeline")
+        columns = (args.well_col, args.time_col, args.rate_col)
+        with profile() if args.profile else nullcontext() as recorder:
+            n = run_field(args.command, args.input, args.output, _job(args), args.jobs, args.chunksize, columns)
+        print(f"{args.command}: {n} well(s) written to {args.output}")
+        _write_profile(recorder, Path(args.output).with_name("profile.json"))
+        return
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+
+    with profile() if args.profile else nullcontext() as recorder:
+        run_pipeline(out, plot=not args.no_plot)
+    _write_profile(recorder, out / "profile.json")
 
 
 if __name__ == "__main__":
@@ -2,18 +2,142 @@ from __future__ import annotations
 
 from dataclasses import asdict
 
+import numpy as np
+
+from .cache import FitCache, content_key
 from .fit import FitOptions, fit_model
-from .validation import cv_rmse
-from .types import Array
+from .initialize import initial_guess
+from .instrument import stage
+from .parallel import run_tasks
+from .validation import blocked_time_series_splits, cv_cache_key, fold_rmse
+from .types import Array, FitResult
+
+
+# First screening round: fits use at least this many points and at most this many evaluations;
+# both double every round.
+SCREEN_MIN_POINTS = 24
+SCREEN_NFEV = 50
+
+
+def _grid_task(
+    model: str,
+    t: Array,
+    q: Array,
+    initial: dict[str, float],
+    split: tuple[Array, Array] | None,
+    options: FitOptions | None = None,
+) -> FitResult | float:
+    if split is None:
+        return fit_model(model, t, q, initial, options or FitOptions())
+    return fold_rmse(model, t, q, initial, *split)
+
 
+def _screen(
+    models: list[str],
+    t: Array,
+    q: Array,
+    initials: dict[str, dict[str, float]],
+    keep: int,
+    backend: str,
+    n_jobs: int | None,
+) -> tuple[list[str], list[dict]]:
+    """Successive halving by BIC down to `keep` models.
+
+    Round r fits the survivors on an evenly strided sample of n / 2^(rounds - r)
+    points with a capped evaluation budget, then keeps the better half. Returns
+    the survivors and the pruned models' screening rows, latest round first.
+    """
+    n = len(t)
+    rounds = max(int(np.ceil(np.log2(len(models) / keep))), 0)
+    survivors = list(models)
+    pruned: list[dict] = []
+    for r in range(rounds):
+        size = min(max(n >> (rounds - r), SCREEN_MIN_POINTS), n)
+        idx = np.linspace(0, n - 1, size).round().astype(int)
+        options = FitOptions(max_nfev=SCREEN_NFEV << r)
+        tasks = [(m, t[idx], q[idx], initials[m], None, options) for m in survivors]
+        with stage("compare.screen") as st:
+            fits = run_tasks(_grid_task, tasks, backend=backend, n_jobs=n_jobs)
+            st.counters.update(round=r, points=size, models=len(survivors))
+        # failed or non-finite screening fits rank last
+        ranked = sorted(
+            zip(survivors, fits, strict=True),
+            key=lambda p: (not p[1].success, np.nan_to_num(p[1].bic, nan=np.inf)),
+        )
+        n_keep = max(keep, (len(survivors) + 1) // 2)
+        survivors = [m for m, _ in ranked[:n_keep]]
+        pruned[:0] = [
+            {**asdict(fit), "cv_rmse": float("nan"), "pruned_at": f"screen-{r}"}
+            for _, fit in ranked[n_keep:]
+        ]
+    return survivors, pruned
+
+
+def compare_models(
+    models: list[str],
+    t: Array,
+    q: Array,
+    initials: dict[str, dict[str, float]] | None = None,
+    backend: str = "serial",
+    n_jobs: int | None = None,
+    cache: FitCache | None = None,
+    screen: int | None = None,
+) -> list[dict]:
+    """Fit and cross-validate every model, ranked by BIC then CV RMSE.
+
+    Models missing from `initials` start from `initial_guess(model, t, q)`.
+    With `screen=k`, successive halving on decimated, budget-capped fits prunes
+    the candidates to the best k by BIC first, and only those get the full fit
+    and CV. Every row then has a `pruned_at` entry: None for the finalists,
+    `"screen-<round>"` otherwise. Pruned rows follow the finalists, latest round
+    first, and carry their screening fit (`n_obs` is the screening sample size)
+    with a NaN `cv_rmse`.
+    """
+    initials = {m: (initials or {}).get(m) or initial_guess(m, t, q) for m in models}
+    pruned: list[dict] = []
+    if screen is not None:
+        if screen < 1:
+            raise ValueError(f"screen must be at least 1, got {screen}")
+        models, pruned = _screen(models, t, q, initials, screen, backend, n_jobs)
+    splits = blocked_time_series_splits(len(t), n_splits=4)
+    fits: dict[str, FitResult] = {}
+    cvs: dict[str, float] = {}
+    fit_keys: dict[str, str] = {}
+    cv_keys: dict[str, str] = {}
+    if cache is not None:
+        for model in models:
+            fit_keys[model] = content_key("fit_model", model, t, q, initials[model], FitOptions())
+            cv_keys[model] = cv_cache_key(model, t, q, initials[model], 4)
+            if (fit := cache.get(fit_keys[model])) is not None:
+                fits[model] = fit
+            if (cv := cache.get(cv_keys[model])) is not None:
+                cvs[model] = cv
+
+    tasks = []
+    for model in models:
+        if model not in fits:
+            tasks.append((model, t, q, initials[model], None))
+        if model not in cvs:
+            tasks.extend((model, t, q, initials[model], split) for split in splits)
+    with stage("compare.grid") as st:
+        out = iter(run_tasks(_grid_task, tasks, backend=backend, n_jobs=n_jobs))
+        st.counters.update(models=len(models), tasks=len(tasks))
 
-def compare_models(models: list[str], t: Array, q: Array, initials: dict[str, dict[str, float]]) -> list[dict]:
     rows = []
     for model in models:
-        fit = fit_model(model, t, q, initials[model], FitOptions())
-        rmse_cv = cv_rmse(model, t, q, initials[model], n_splits=4)
-        row = asdict(fit)
-        row["cv_rmse"] = rmse_cv
+        if model not in fits:
+            fits[model] = next(out)
+            if cache is not None:
+                cache.set(fit_keys[model], fits[model])
+        if model not in cvs:
+            cvs[model] = float(np.mean([next(out) for _ in splits]))
+            if cache is not None:
+                cache.set(cv_keys[model], cvs[model])
+        row = asdict(fits[model])
+        row["cv_rmse"] = cvs[model]
+        if screen is not None:
+            row["pruned_at"] = None
         rows.append(row)
     rows.sort(key=lambda r: (r["bic"], r["cv_rmse"]))
+    rows.extend(pruned)
     return rows
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import csv
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 import numpy as np
@@ -8,6 +8,8 @@ import numpy as np
 from .simulate import simulate
 from .types import Array
 
+WELL_COLUMNS = ("well_id", "time", "rate")
+
 
 def synthetic_time_grid(n: int = 180, t_max: float = 36.0) -> Array:
     return np.linspace(0.0, t_max, n)
@@ -23,8 +25,108 @@ def generate_synthetic_dataset(seed: int = 123) -> tuple[Array, Array, dict[str,
 def save_dataset_csv(path: str | Path, t: Array, q: Array) -> None:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["time", "rate"])
-        for ti, qi in zip(t, q, strict=True):
-            w.writerow([float(ti), float(qi)])
+    data = np.column_stack([np.asarray(t, dtype=float), np.asarray(q, dtype=float)])
+    np.savetxt(p, data, delimiter=",", fmt="%.17g", header="time,rate", comments="", encoding="utf-8")
+
+
+def save_wells_csv(path: str | Path, well_ids: Array, t: Array, q: Array) -> None:
+    """Bulk-write a long-format (well_id, time, rate) production file."""
+    import pandas as pd
+
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    frame = pd.DataFrame(dict(zip(WELL_COLUMNS, (well_ids, t, q), strict=True)))
+    frame.to_csv(p, index=False, float_format="%.17g")
+
+
+def save_wells_npy(path: str | Path, well_ids: Array, t: Array, q: Array) -> None:
+    """Write a structured .npy file that `stream_wells` can memory-map."""
+    well_ids = np.asarray(well_ids)
+    if well_ids.dtype.kind not in "iuU":
+        well_ids = well_ids.astype(str)
+    rows = np.empty(len(well_ids), dtype=[("well_id", well_ids.dtype), ("time", "f8"), ("rate", "f8")])
+    rows["well_id"], rows["time"], rows["rate"] = well_ids, t, q
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    np.save(p, rows)
+
+
+def _csv_chunks(path: Path, cols: tuple[str, str, str], chunksize: int) -> Iterator[tuple[Array, Array, Array]]:
+    import pandas as pd
+
+    with pd.read_csv(path, usecols=list(cols), chunksize=chunksize, float_precision="round_trip") as reader:
+        for frame in reader:
+            yield frame[cols[0]].to_numpy(), frame[cols[1]].to_numpy(float), frame[cols[2]].to_numpy(float)
+
+
+def _parquet_chunks(path: Path, cols: tuple[str, str, str], chunksize: int) -> Iterator[tuple[Array, Array, Array]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Reading Parquet files requires pyarrow") from exc
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=list(cols)):
+        yield tuple(batch.column(c).to_numpy(zero_copy_only=False) for c in cols)
+
+
+def _npy_chunks(path: Path, cols: tuple[str, str, str], chunksize: int) -> Iterator[tuple[Array, Array, Array]]:
+    rows = np.load(path, mmap_mode="r")
+    for start in range(0, len(rows), chunksize):
+        chunk = rows[start : start + chunksize]
+        yield np.asarray(chunk[cols[0]]), np.asarray(chunk[cols[1]], dtype=float), np.asarray(chunk[cols[2]], dtype=float)
+
+
+def _group_chunks(chunks: Iterable[tuple[Array, Array, Array]]) -> Iterator[tuple[object, Array, Array]]:
+    """Join chunk slices into whole wells; the chunk source is closed even if iteration stops early."""
+    try:
+        seen: set[object] = set()
+        pending: tuple[object, list[Array], list[Array]] | None = None
+        for ids, t, q in chunks:
+            if len(ids) == 0:
+                continue
+            bounds = np.concatenate(([0], np.flatnonzero(ids[1:] != ids[:-1]) + 1, [len(ids)]))
+            for a, b in zip(bounds[:-1], bounds[1:], strict=True):
+                wid = ids[a].item() if isinstance(ids[a], np.generic) else ids[a]
+                if pending is not None and pending[0] == wid:
+                    pending[1].append(t[a:b])
+                    pending[2].append(q[a:b])
+                    continue
+                if pending is not None:
+                    yield pending[0], np.concatenate(pending[1]), np.concatenate(pending[2])
+                if wid in seen:
+                    raise ValueError(f"Rows for well {wid!r} are not contiguous; sort the file by well first")
+                seen.add(wid)
+                pending = (wid, [t[a:b]], [q[a:b]])
+        if pending is not None:
+            yield pending[0], np.concatenate(pending[1]), np.concatenate(pending[2])
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def stream_wells(
+    path: str | Path,
+    well_col: str = "well_id",
+    time_col: str = "time",
+    rate_col: str = "rate",
+    chunksize: int = 100_000,
+) -> Iterator[tuple[object, Array, Array]]:
+    """Yield (well_id, t, q) per well from a long-format production file.
+
+    The file is read in chunks of `chunksize` rows, so only one chunk plus the
+    current well is held in memory; rows must be grouped by well. Supports CSV,
+    Parquet (requires pyarrow) and structured `.npy` files (memory-mapped).
+    """
+    p = Path(path)
+    cols = (well_col, time_col, rate_col)
+    suffixes = p.suffixes
+    if ".parquet" in suffixes or ".pq" in suffixes:
+        chunks = _parquet_chunks(p, cols, chunksize)
+    elif p.suffix == ".npy":
+        chunks = _npy_chunks(p, cols, chunksize)
+    elif ".csv" in suffixes:
+        chunks = _csv_chunks(p, cols, chunksize)
+    else:
+        raise ValueError(f"Unsupported production file format: {p.name}")
+    return _group_chunks(chunks)
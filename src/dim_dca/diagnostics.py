@@ -1,22 +1,81 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 import numpy as np
 
 from .types import Array
 
+# Rows processed per block; temporaries never exceed a few blocks, so memory-mapped
+# inputs of any length are read through a bounded window.
+CHUNK_SIZE = 1 << 16
+
+# np.gradient of np.gradient reaches two samples to each side
+_HALO = 2
 
-def residual_diagnostics(y_true: Array, y_pred: Array) -> dict[str, float]:
-    r = y_true - y_pred
-    mse = float(np.mean(r**2))
-    rmse = float(np.sqrt(mse))
-    mae = float(np.mean(np.abs(r)))
-    mape = float(np.mean(np.abs(r / np.maximum(y_true, 1e-12))))
-    return {"mse": mse, "rmse": rmse, "mae": mae, "mape": mape}
 
+def residual_diagnostics(y_true: Array, y_pred: Array, chunk_size: int = CHUNK_SIZE) -> dict[str, float]:
+    n = len(y_true)
+    sse = sae = sape = 0.0
+    for start in range(0, n, chunk_size):
+        yt = np.asarray(y_true[start : start + chunk_size], dtype=float)
+        r = yt - np.asarray(y_pred[start : start + chunk_size], dtype=float)
+        sse += float(np.dot(r, r))
+        np.abs(r, out=r)
+        sae += float(np.sum(r))
+        r /= np.maximum(yt, 1e-12)
+        sape += float(np.sum(r))
+    with np.errstate(invalid="ignore"):
+        mse, mae, mape = (float(np.float64(total) / n) for total in (sse, sae, sape))
+    return {"mse": mse, "rmse": float(np.sqrt(mse)), "mae": mae, "mape": mape}
 
-def loglog_curvature(t: Array, q: Array) -> Array:
-    lt = np.log(np.maximum(t, 1e-8))
-    lq = np.log(np.maximum(q, 1e-12))
+
+def _curvature(t: Array, q: Array) -> Array:
+    lt = np.log(np.maximum(np.asarray(t, dtype=float), 1e-8))
+    lq = np.log(np.maximum(np.asarray(q, dtype=float), 1e-12))
     d1 = np.gradient(lq, lt)
-    d2 = np.gradient(d1, lt)
-    return d2
+    return np.gradient(d1, lt)
+
+
+def _curvature_window(t: Array, q: Array, start: int, stop: int) -> Array:
+    """Curvature on [start, stop), computed from the slice plus a two-sample halo.
+
+    The result is identical to the same part of the whole-series curvature.
+    """
+    n = len(t)
+    lo, hi = max(start - _HALO, 0), min(stop + _HALO, n)
+    return _curvature(t[lo:hi], q[lo:hi])[start - lo : stop - lo]
+
+
+def iter_loglog_curvature(t: Array, q: Array, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[int, Array]]:
+    """Yield (start, curvature[start:start + chunk_size]) blocks with bounded memory."""
+    for start in range(0, len(t), chunk_size):
+        yield start, _curvature_window(t, q, start, min(start + chunk_size, len(t)))
+
+
+def loglog_curvature(t: Array, q: Array, chunk_size: int = CHUNK_SIZE, out: Array | None = None) -> Array:
+    """d^2 ln q / d (ln t)^2, computed blockwise; `out` may be a memory-mapped array."""
+    out = np.empty(len(t)) if out is None else out
+    for start, block in iter_loglog_curvature(t, q, chunk_size):
+        out[start : start + len(block)] = block
+    return out
+
+
+def curvature_peaks(t: Array, q: Array, height: float, chunk_size: int = CHUNK_SIZE, halo: int = 64) -> Array:
+    """Indices of peaks in |log-log curvature| at or above `height`, found block by block.
+
+    Blocks overlap by `halo` samples, so peaks match `scipy.signal.find_peaks`
+    on the whole series unless a flat top wider than `halo` straddles a block
+    boundary.
+    """
+    from scipy import signal
+
+    n = len(t)
+    found = [np.empty(0, dtype=np.intp)]
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        lo, hi = max(start - halo, 0), min(stop + halo, n)
+        peaks, _ = signal.find_peaks(np.abs(_curvature_window(t, q, lo, hi)), height=height)
+        peaks = peaks + lo
+        found.append(peaks[(peaks >= start) & (peaks < stop)])
+    return np.concatenate(found)
@@ -3,11 +3,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 import numpy as np
-from scipy import signal
 
+from .batch import Wells, stack_wells
 from .diagnostics import loglog_curvature
 from .types import Array
 
+H1_THRESHOLD = 0.85
+H2_QUANTILE = 0.8
+H3_THRESHOLD = 0.9
+
 
 @dataclass
 class HypothesisResult:
@@ -27,15 +31,17 @@ def test_scaling_invariant(t: Array, q: Array, di: float, qi: float) -> Hypothes
         name="H1_scaling",
         hypothesis="Dimensionless coordinates preserve decline shape under multiplicative scaling.",
         metric=abs(corr),
-        passed=abs(corr) > 0.85,
+        passed=abs(corr) > H1_THRESHOLD,
         falsification_rule="Fail if |corr(log(1+tau), log(qd))| <= 0.85",
     )
 
 
 def test_curvature_changepoints(t: Array, q: Array) -> HypothesisResult:
     """H2: Regime shifts appear as peaks in log-log curvature."""
+    from scipy import signal
+
     curv = np.abs(loglog_curvature(t, q))
-    peaks, _ = signal.find_peaks(curv, height=np.quantile(curv, 0.8))
+    peaks, _ = signal.find_peaks(curv, height=np.quantile(curv, H2_QUANTILE))
     n_peaks = int(len(peaks))
     return HypothesisResult(
         name="H2_regime",
@@ -58,7 +64,7 @@ def symbolic_surrogate_exponents(t: Array, q: Array) -> HypothesisResult:
         name="H3_symbolic",
         hypothesis="Quadratic polynomial in log-time is a constrained symbolic surrogate.",
         metric=float(r2),
-        passed=float(r2) > 0.9,
+        passed=float(r2) > H3_THRESHOLD,
         falsification_rule="Fail if surrogate R^2 <= 0.9 in log space.",
     )
 
@@ -69,3 +75,129 @@ def run_exploratory_suite(t: Array, q: Array, di: float, qi: float) -> list[Hypo
         test_curvature_changepoints(t, q),
         symbolic_surrogate_exponents(t, q),
     ]
+
+
+@dataclass
+class ExploratoryTable:
+    """H1-H3 metrics for many wells, one row per well."""
+
+    well_id: Array
+    h1_corr: Array
+    h2_peaks: Array
+    h3_r2: Array
+    h3_coef: Array
+
+    def __len__(self) -> int:
+        return len(self.well_id)
+
+    @property
+    def h1_passed(self) -> Array:
+        return self.h1_corr > H1_THRESHOLD
+
+    @property
+    def h2_passed(self) -> Array:
+        return self.h2_peaks >= 1
+
+    @property
+    def h3_passed(self) -> Array:
+        return self.h3_r2 > H3_THRESHOLD
+
+
+def _segment_gradient(f: Array, x: Array, first: Array, last: Array) -> Array:
+    """np.gradient(f, x) applied independently to every segment (edge_order=1)."""
+    out = np.empty_like(f)
+    if f.size > 2:
+        dx1, dx2 = np.diff(x)[:-1], np.diff(x)[1:]
+        a = -dx2 / (dx1 * (dx1 + dx2))
+        b = (dx2 - dx1) / (dx1 * dx2)
+        c = dx1 / (dx2 * (dx1 + dx2))
+        out[1:-1] = a * f[:-2] + b * f[1:-1] + c * f[2:]
+    # one-sided differences at both ends of every segment
+    out[first] = (f[first + 1] - f[first]) / (x[first + 1] - x[first])
+    out[last] = (f[last] - f[last - 1]) / (x[last] - x[last - 1])
+    return out
+
+
+def _segment_quantile(values: Array, seg: Array, bounds: Array, p: float) -> Array:
+    """Per-segment linear-interpolated quantile, as np.quantile would compute it."""
+    ordered = values[np.lexsort((values, seg))]
+    pos = p * (np.diff(bounds) - 1)
+    lo = np.floor(pos).astype(np.int64)
+    frac = pos - lo
+    a = ordered[bounds[:-1] + lo]
+    b = ordered[bounds[:-1] + np.minimum(lo + 1, np.diff(bounds) - 1)]
+    # numpy's quantile lerp: interpolate from the nearer end for accuracy
+    return np.where(frac >= 0.5, b - (b - a) * (1.0 - frac), a + (b - a) * frac)
+
+
+def run_exploratory_field(wells: Wells, di: float | Array, qi: float | Array | None = None) -> ExploratoryTable:
+    """H1-H3 for every well with shared transforms and one stacked H3 solve.
+
+    `di` and `qi` are scalars or per-well arrays in output well order (qi
+    defaults to each well's peak rate). Every well needs at least two samples.
+    H2 counts strict local maxima of |curvature| at or above the well's 80th
+    percentile, which matches `find_peaks` except on exactly flat tops.
+    """
+    ids, t, q, bounds = stack_wells(wells)
+    m = len(ids)
+    counts = np.diff(bounds)
+    if np.any(counts < 2):
+        raise ValueError("Every well needs at least two samples")
+    seg = np.repeat(np.arange(m), counts)
+    first, last = bounds[:-1], bounds[1:] - 1
+
+    def sums(v: Array) -> Array:
+        return np.add.reduceat(v, first)
+
+    lq = np.log(np.maximum(q, 1e-12))
+    if qi is None:
+        qi = np.maximum.reduceat(q, first)
+    di_rows = np.broadcast_to(np.asarray(di, dtype=float), (m,))[seg]
+    qi_rows = np.broadcast_to(np.asarray(qi, dtype=float), (m,))[seg]
+
+    # H1: correlation of log(1 + tau) with log(qd) per well
+    x1 = np.log1p(di_rows * t)
+    y1 = np.log(np.maximum(q / qi_rows, 1e-12))
+    x1c = x1 - (sums(x1) / counts)[seg]
+    y1c = y1 - (sums(y1) / counts)[seg]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.abs(sums(x1c * y1c) / np.sqrt(sums(x1c**2) * sums(y1c**2)))
+
+    # H2: log-log curvature with per-well one-sided edges, then local maxima
+    lt = np.log(np.maximum(t, 1e-8))
+    curv = np.abs(_segment_gradient(_segment_gradient(lq, lt, first, last), lt, first, last))
+    height = _segment_quantile(curv, seg, bounds, H2_QUANTILE)
+    interior = np.ones(len(t), dtype=bool)
+    interior[first] = interior[last] = False
+    peak = np.zeros(len(t), dtype=bool)
+    peak[1:-1] = (curv[1:-1] > curv[:-2]) & (curv[1:-1] > curv[2:])
+    peak &= interior & (curv >= height[seg])
+    n_peaks = sums(peak.astype(np.int64))
+
+    # H3: quadratic in log(t + 1), all wells solved as one (m, 3, 3) stack. x is
+    # centered and scaled per well first; raw powers of x make the normal
+    # equations ill-conditioned.
+    x = np.log(np.maximum(t + 1.0, 1e-12))
+    mu = sums(x) / counts
+    xc = x - mu[seg]
+    scale = np.sqrt(sums(xc**2) / counts)
+    scale = np.where(scale > 0, scale, 1.0)
+    z = xc / scale[seg]
+    powers = np.stack([sums(z**p) for p in range(5)], axis=1)
+    ata = powers[:, [[0, 1, 2], [1, 2, 3], [2, 3, 4]]]
+    aty = np.stack([sums(lq), sums(z * lq), sums(z**2 * lq)], axis=1)
+    c = (np.linalg.pinv(ata) @ aty[:, :, None])[:, :, 0]
+    resid = lq - (c[seg, 0] + c[seg, 1] * z + c[seg, 2] * z**2)
+    # back to coefficients of 1, x, x^2
+    coef = np.column_stack(
+        [
+            c[:, 0] - c[:, 1] * mu / scale + c[:, 2] * (mu / scale) ** 2,
+            c[:, 1] / scale - 2.0 * c[:, 2] * mu / scale**2,
+            c[:, 2] / scale**2,
+        ]
+    )
+    yc = lq - (sums(lq) / counts)[seg]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r2 = 1.0 - sums(resid**2) / sums(yc**2)
+
+    return ExploratoryTable(well_id=ids, h1_corr=corr, h2_peaks=n_peaks, h3_r2=r2, h3_coef=coef)
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
 
 import numpy as np
-from scipy.optimize import differential_evolution, least_squares, minimize
 
-from .models import MODEL_SPECS, RATE_FUNCS
-from .objectives import huber_loss, ls_loss
-from .types import Array, FitResult
+from .cache import FitCache, content_key
+from .initialize import initial_guess
+from .instrument import Stage, stage
+from .models import JAC_KERNELS, MODEL_SPECS, RATE_KERNELS
+from .objectives import huber_loss, huber_loss_batch, ls_loss, ls_loss_batch
+from .types import Array, FitResult, KernelCallable
+
+if TYPE_CHECKING:
+    from scipy.optimize import OptimizeResult
 
 
 @dataclass
@@ -16,6 +23,7 @@ class FitOptions:
     global_search: bool = False
     robust_delta: float = 1.0
     max_nfev: int = 20_000
+    vectorized_global: bool = True
 
 
 def _pack(params: dict[str, float], order: tuple[str, ...]) -> Array:
@@ -26,88 +34,237 @@ def _unpack(theta: Array, order: tuple[str, ...]) -> dict[str, float]:
     return {k: float(v) for k, v in zip(order, theta, strict=True)}
 
 
-def fit_model(model: str, t: Array, q: Array, initial: dict[str, float], options: FitOptions | None = None) -> FitResult:
-    options = options or FitOptions()
-    spec = MODEL_SPECS[model]
-    rate_fn = RATE_FUNCS[model]
+def _loss(q: Array, qp: Array, options: FitOptions) -> float:
+    if options.objective == "huber":
+        return huber_loss(q, qp, options.robust_delta)
+    return ls_loss(q, qp)
 
-    theta0 = _pack(initial, spec.param_order)
-    lb, ub = np.array(spec.bounds[0]), np.array(spec.bounds[1])
+
+def _population_loss(q: Array, qp: Array, options: FitOptions) -> Array:
+    if options.objective == "huber":
+        loss = huber_loss_batch(q, qp, options.robust_delta)
+    else:
+        loss = ls_loss_batch(q, qp)
+    return np.where(np.isfinite(loss), loss, np.inf)
+
+
+def _global_init(rate_fn: KernelCallable, lb: Array, ub: Array, t: Array, q: Array, options: FitOptions) -> OptimizeResult:
+    from scipy.optimize import differential_evolution
+
+    bounds = list(zip(lb, ub, strict=True))
+    if options.vectorized_global:
+        # score the whole population (k, S) with one broadcasted kernel call
+        def population(thetas: Array) -> Array:
+            with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+                return _population_loss(q, rate_fn(t, thetas.T), options)
+
+        return differential_evolution(population, bounds=bounds, polish=False, seed=123, vectorized=True, updating="deferred")
+
+    def objective(theta: Array) -> float:
+        return _loss(q, rate_fn(t, theta), options)
+
+    return differential_evolution(objective, bounds=bounds, polish=False, seed=123)
+
+
+def _information_criteria(rss: float, n: int, k: int) -> tuple[float, float]:
+    ll = n * np.log(max(rss / n, 1e-12))
+    return float(ll + 2 * k), float(ll + k * np.log(n))
+
+
+def _covariance(jac: Array, rss: float, n: int) -> Array | None:
+    """Asymptotic covariance sigma^2 (J^T J)^-1, or None when J^T J is singular."""
+    if jac.size == 0:
+        return None
+    sigma2 = max(rss / max(n - jac.shape[1], 1), 1e-12)
+    try:
+        return sigma2 * np.linalg.inv(jac.T @ jac)
+    except np.linalg.LinAlgError:
+        return None
+
+
+@dataclass
+class _SolveStats:
+    nfev: int = 0
+    njev: int = 0
+    stage_times: dict[str, float] = field(default_factory=dict)
+
+    def add(self, st: Stage) -> None:
+        self.nfev += st.counters.get("nfev", 0)
+        self.njev += st.counters.get("njev", 0)
+        self.stage_times[st.name] = self.stage_times.get(st.name, 0.0) + st.seconds
+
+
+def _solve(
+    rate_fn: KernelCallable,
+    jac_fn: KernelCallable,
+    lb: Array,
+    ub: Array,
+    t: Array,
+    q: Array,
+    theta0: Array,
+    options: FitOptions,
+    x_scale: Array | float = 1.0,
+):
+    from scipy.optimize import least_squares
 
     def pred(theta: Array) -> Array:
-        return rate_fn(t, _unpack(theta, spec.param_order))
+        return rate_fn(t, theta)
 
     def res(theta: Array) -> Array:
         return q - pred(theta)
 
+    def res_jac(theta: Array) -> Array:
+        return -jac_fn(t, theta)
+
+    stats = _SolveStats()
     if options.global_search:
-        bounds = list(zip(lb, ub, strict=True))
+        with stage("fit.global_search") as st:
+            de = _global_init(rate_fn, lb, ub, t, q, options)
+            st.counters["nfev"] = de.nfev
+        theta0 = de.x
+        stats.add(st)
 
-        def objective(theta: Array) -> float:
-            qp = pred(theta)
-            if options.objective == "huber":
-                return huber_loss(q, qp, options.robust_delta)
-            return ls_loss(q, qp)
+    with stage("fit.least_squares") as st:
+        result = least_squares(res, theta0, jac=res_jac, bounds=(lb, ub), x_scale=x_scale, max_nfev=options.max_nfev)
+        st.counters.update(nfev=result.nfev, njev=result.njev or 0)
+    stats.add(st)
+    return result, pred(result.x), stats
 
-        de = differential_evolution(objective, bounds=bounds, polish=False, seed=123)
-        theta0 = de.x
 
-    result = least_squares(res, theta0, bounds=(lb, ub), max_nfev=options.max_nfev)
-    theta = result.x
-    qp = pred(theta)
+def fit_model(
+    model: str,
+    t: Array,
+    q: Array,
+    initial: dict[str, float] | None = None,
+    options: FitOptions | None = None,
+    cache: FitCache | None = None,
+) -> FitResult:
+    """Bounded least-squares fit; `initial=None` starts from `initial_guess(model, t, q)`."""
+    options = options or FitOptions()
+    if initial is None:
+        initial = initial_guess(model, t, q)
+    if cache is not None:
+        key = content_key("fit_model", model, t, q, initial, options)
+        return cache.get_or_compute(key, lambda: fit_model(model, t, q, initial, options))
+    start = time.perf_counter()
+    spec = MODEL_SPECS[model]
+    rate_fn = RATE_KERNELS[model]
+    jac_fn = JAC_KERNELS[model]
 
-    if options.objective == "huber":
-        loss = huber_loss(q, qp, options.robust_delta)
-    else:
-        loss = ls_loss(q, qp)
+    theta0 = _pack(initial, spec.param_order)
+    lb, ub = np.array(spec.bounds[0]), np.array(spec.bounds[1])
+    result, qp, stats = _solve(rate_fn, jac_fn, lb, ub, t, q, theta0, options)
+    return _fit_result(model, q, qp, result, options, stats, time.perf_counter() - start)
 
+
+def _fit_result(
+    model: str,
+    q: Array,
+    qp: Array,
+    result: OptimizeResult,
+    options: FitOptions,
+    stats: _SolveStats,
+    wall_time: float,
+) -> FitResult:
+    theta = result.x
+    loss = _loss(q, qp, options)
     n = len(q)
     k = len(theta)
     rss = np.sum((q - qp) ** 2)
-    sigma2 = max(rss / max(n - k, 1), 1e-12)
-    aic = n * np.log(max(rss / n, 1e-12)) + 2 * k
-    bic = n * np.log(max(rss / n, 1e-12)) + k * np.log(n)
-
-    cov = None
-    if result.jac.size > 0:
-        jtj = result.jac.T @ result.jac
-        try:
-            cov = sigma2 * np.linalg.inv(jtj)
-        except np.linalg.LinAlgError:
-            cov = None
+    aic, bic = _information_criteria(rss, n, k)
+    cov = _covariance(result.jac, rss, n)
 
     return FitResult(
         model=model,
-        params=_unpack(theta, spec.param_order),
+        params=_unpack(theta, MODEL_SPECS[model].param_order),
         success=bool(result.success),
         objective=options.objective,
         loss=float(loss),
-        aic=float(aic),
-        bic=float(bic),
+        aic=aic,
+        bic=bic,
         covariance=cov,
         message=result.message,
         n_obs=n,
         n_params=k,
+        nfev=stats.nfev,
+        njev=stats.njev,
+        wall_time=wall_time,
+        stage_times=stats.stage_times,
     )
 
 
+def update_fit(
+    previous: FitResult,
+    t: Array,
+    q: Array,
+    options: FitOptions | None = None,
+    drift_tol: float = 3.0,
+) -> FitResult:
+    """Refit after new observations were appended to the series `previous` was fit on.
+
+    `t`, `q` hold the full history, whose first `previous.n_obs` points are the
+    data of the previous fit. The solve is warm-started from the previous
+    parameters, with steps scaled by their standard errors. Global search (if
+    enabled in `options`) only runs when the appended points drift from the
+    previous forecast by more than `drift_tol` residual standard deviations (RMS).
+    """
+    options = options or FitOptions()
+    start = time.perf_counter()
+    model = previous.model
+    n_old = previous.n_obs
+    if len(q) < n_old:
+        raise ValueError("update_fit expects the previous observations plus the appended ones")
+    spec = MODEL_SPECS[model]
+    rate_fn = RATE_KERNELS[model]
+    jac_fn = JAC_KERNELS[model]
+    lb, ub = np.array(spec.bounds[0]), np.array(spec.bounds[1])
+    theta0 = _pack(previous.params, spec.param_order)
+
+    pred = rate_fn(t, theta0)
+    r_old, r_new = q[:n_old] - pred[:n_old], q[n_old:] - pred[n_old:]
+    sigma2 = max(float(np.dot(r_old, r_old)) / max(n_old - len(theta0), 1), 1e-12)
+    drift = r_new.size > 0 and float(np.sqrt(np.mean(r_new**2) / sigma2)) > drift_tol
+
+    x_scale: Array | float = 1.0
+    if previous.covariance is not None:
+        se = np.sqrt(np.abs(np.diag(previous.covariance)))
+        if np.all(np.isfinite(se)) and np.all(se > 0):
+            x_scale = se
+    run_options = replace(options, global_search=options.global_search and drift)
+    result, qp, stats = _solve(rate_fn, jac_fn, lb, ub, t, q, theta0, run_options, x_scale=x_scale)
+    return _fit_result(model, q, qp, result, options, stats, time.perf_counter() - start)
+
+
 def fit_bayesian_map(model: str, t: Array, q: Array, initial: dict[str, float], sigma: float = 1.0) -> FitResult:
+    from scipy.optimize import minimize
+
     spec = MODEL_SPECS[model]
-    rate_fn = RATE_FUNCS[model]
+    rate_fn = RATE_KERNELS[model]
+    jac_fn = JAC_KERNELS[model]
     theta0 = _pack(initial, spec.param_order)
     lb, ub = np.array(spec.bounds[0]), np.array(spec.bounds[1])
 
-    def neg_log_post(theta: Array) -> float:
+    def neg_log_post(theta: Array) -> tuple[float, Array]:
         if np.any(theta < lb) or np.any(theta > ub):
-            return np.inf
-        pred = rate_fn(t, _unpack(theta, spec.param_order))
-        nll = 0.5 * np.sum(((q - pred) / sigma) ** 2)
-        return float(nll)
+            return np.inf, np.zeros_like(theta)
+        r = (q - rate_fn(t, theta)) / sigma
+        nll = 0.5 * np.sum(r**2)
+        return float(nll), -(r / sigma) @ jac_fn(t, theta)
 
-    r = minimize(neg_log_post, theta0, method="L-BFGS-B", bounds=list(zip(lb, ub, strict=True)))
+    start = time.perf_counter()
+    with stage("fit.bayesian_map") as st:
+        r = minimize(neg_log_post, theta0, jac=True, method="L-BFGS-B", bounds=list(zip(lb, ub, strict=True)))
+        st.counters.update(nfev=r.nfev, njev=r.njev)
     theta = r.x
     n = len(q)
     k = len(theta)
+
+    jac = jac_fn(t, theta)
+    try:
+        cov = np.linalg.inv(jac.T @ jac / sigma**2)
+    except np.linalg.LinAlgError:
+        cov = None
+
     return FitResult(
         model=model,
         params=_unpack(theta, spec.param_order),
@@ -116,8 +273,12 @@ def fit_bayesian_map(model: str, t: Array, q: Array, initial: dict[str, float],
         loss=float(r.fun),
         aic=float(2 * k + 2 * r.fun),
         bic=float(k * np.log(n) + 2 * r.fun),
-        covariance=None,
+        covariance=cov,
         message=r.message,
         n_obs=n,
         n_params=k,
+        nfev=int(r.nfev),
+        njev=int(r.njev),
+        wall_time=time.perf_counter() - start,
+        stage_times={st.name: st.seconds},
     )
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from .models import CUM_KERNELS, MODEL_SPECS, RATE_KERNELS
+from .types import Array
+
+# Reserves convention: P10 is the high case, exceeded with 10% probability.
+EXCEEDANCE = {"P10": 0.9, "P50": 0.5, "P90": 0.1}
+
+
+@dataclass
+class ForecastResult:
+    rate: Array | None
+    cum: Array | None
+    t_limit: Array
+    eur: Array
+    reached: Array
+
+
+def param_matrix(model: str, params: Array | Mapping[str, float] | Sequence[Mapping[str, float]]) -> Array:
+    """Coerce a dict, list of dicts, (k,) vector or (n_sets, k) matrix to (n_sets, k)."""
+    order = MODEL_SPECS[model].param_order
+    if isinstance(params, Mapping):
+        params = [params]
+    if len(params) and isinstance(params[0], Mapping):
+        params = [[p[k] for k in order] for p in params]
+    return np.atleast_2d(np.asarray(params, dtype=float)).reshape(-1, len(order))
+
+
+def _time_to_limit(model: str, theta: Array, q_limit: float, t_max: float, n_grid: int, n_bisect: int) -> tuple[Array, Array]:
+    rate_fn = RATE_KERNELS[model]
+    grid = np.linspace(0.0, t_max, n_grid)
+    above = rate_fn(grid, theta) >= q_limit
+    any_above = above.any(axis=1)
+    last = n_grid - 1 - np.argmax(above[:, ::-1], axis=1)
+    reached = ~any_above | (last < n_grid - 1)
+    t_limit = np.where(any_above, t_max, 0.0)
+
+    # bisection on the final downward crossing, all sets in lockstep
+    cross = np.flatnonzero(any_above & (last < n_grid - 1))
+    lo, hi = grid[last[cross]], grid[last[cross] + 1]
+    sub = theta[cross]
+    for _ in range(n_bisect):
+        mid = 0.5 * (lo + hi)
+        ok = rate_fn(mid[:, None], sub)[:, 0] >= q_limit
+        lo = np.where(ok, mid, lo)
+        hi = np.where(ok, hi, mid)
+    t_limit[cross] = 0.5 * (lo + hi)
+    return t_limit, reached
+
+
+def forecast(
+    model: str,
+    params: Array | Mapping[str, float] | Sequence[Mapping[str, float]],
+    horizon: Array,
+    q_limit: float = 0.0,
+    t_max: float | None = None,
+    chunk_size: int = 4096,
+    curves: bool = True,
+    n_grid: int = 512,
+    n_bisect: int = 60,
+) -> ForecastResult:
+    """Rate/cumulative curves, time to the economic limit and EUR for many parameter sets.
+
+    The limit is the last downward crossing of `q_limit` within [0, t_max]
+    (default: the end of `horizon`); sets still above the limit at t_max report
+    `reached=False` and EUR at t_max. Parameter sets are processed in chunks of
+    `chunk_size` rows so temporaries stay bounded; `curves=False` skips the
+    (n_sets, n_h) rate and cumulative outputs.
+    """
+    theta = param_matrix(model, params)
+    horizon = np.asarray(horizon, dtype=float)
+    t_max = float(horizon[-1]) if t_max is None else float(t_max)
+    n = theta.shape[0]
+    rate = np.empty((n, horizon.size)) if curves else None
+    cum = np.empty((n, horizon.size)) if curves else None
+    t_limit = np.empty(n)
+    reached = np.empty(n, dtype=bool)
+    eur = np.empty(n)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for start in range(0, n, chunk_size):
+            sl = slice(start, start + chunk_size)
+            sub = theta[sl]
+            if curves:
+                rate[sl] = RATE_KERNELS[model](horizon, sub)
+                cum[sl] = CUM_KERNELS[model](horizon, sub)
+            t_limit[sl], reached[sl] = _time_to_limit(model, sub, q_limit, t_max, n_grid, n_bisect)
+            eur[sl] = CUM_KERNELS[model](t_limit[sl, None], sub)[:, 0]
+    return ForecastResult(rate=rate, cum=cum, t_limit=t_limit, eur=eur, reached=reached)
+
+
+def forecast_quantiles(
+    model: str,
+    params: Array | Sequence[Mapping[str, float]],
+    horizon: Array,
+    q_limit: float = 0.0,
+    t_max: float | None = None,
+    chunk_size: int = 4096,
+    max_elements: int = 2**22,
+) -> dict[str, dict[str, Array]]:
+    """P10/P50/P90 (exceedance) of rate, cumulative, time to limit and EUR.
+
+    Curves are aggregated over blocks of horizon columns, so at most about
+    `max_elements` values are alive at once regardless of the number of sets.
+    """
+    theta = param_matrix(model, params)
+    horizon = np.asarray(horizon, dtype=float)
+    probs = np.array(list(EXCEEDANCE.values()))
+    scalars = forecast(model, theta, horizon, q_limit, t_max, chunk_size=chunk_size, curves=False)
+
+    block = max(1, max_elements // max(theta.shape[0], 1))
+    rate_q = np.empty((probs.size, horizon.size))
+    cum_q = np.empty((probs.size, horizon.size))
+    with np.errstate(over="ignore", invalid="ignore"):
+        for start in range(0, horizon.size, block):
+            cols = horizon[start : start + block]
+            rate_q[:, start : start + block] = np.quantile(RATE_KERNELS[model](cols, theta), probs, axis=0)
+            cum_q[:, start : start + block] = np.quantile(CUM_KERNELS[model](cols, theta), probs, axis=0)
+
+    eur_q = np.quantile(scalars.eur, probs)
+    t_limit_q = np.quantile(scalars.t_limit, probs)
+    out: dict[str, dict[str, Array]] = {}
+    for i, name in enumerate(EXCEEDANCE):
+        out[name] = {"rate": rate_q[i], "cum": cum_q[i], "eur": eur_q[i], "t_limit": t_limit_q[i]}
+    return out
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+
+from .models import MODEL_SPECS, RATE_KERNELS
+from .types import Array
+
+# Guesses are computed on at most this many evenly strided points; they only need the shape.
+MAX_POINTS = 512
+
+
+def _linfit(x: Array, y: Array) -> tuple[Array, Array]:
+    """Row-wise least-squares line y = intercept + slope * x for (m, n) stacks."""
+    xm = x.mean(axis=-1, keepdims=True)
+    ym = y.mean(axis=-1, keepdims=True)
+    xc = x - xm
+    slope = np.sum(xc * (y - ym), axis=-1) / np.maximum(np.sum(xc * xc, axis=-1), 1e-300)
+    return slope, (ym - slope[..., None] * xm)[..., 0]
+
+
+def _arps_exp(t: Array, q: Array) -> Array:
+    # ln q = ln qi - di t
+    slope, intercept = _linfit(t, np.log(q))
+    return np.array([[np.exp(intercept), -slope]])
+
+
+def _arps_harm(t: Array, q: Array) -> Array:
+    # 1/q = 1/qi + (di/qi) t
+    slope, intercept = _linfit(t, 1.0 / q)
+    return np.array([[1.0 / intercept, slope / intercept]])
+
+
+def _arps_hyp(t: Array, q: Array) -> Array:
+    # for fixed b, q^-b = qi^-b (1 + b di t) is linear in t
+    b = np.linspace(0.05, 1.95, 39)[:, None]
+    slope, intercept = _linfit(t, q ** -b)
+    b = b[:, 0]
+    hyp = np.column_stack([intercept ** (-1.0 / b), slope / (intercept * b), b])
+    exp = _arps_exp(t, q)[0]
+    return np.vstack([hyp, [exp[0], exp[1], 1e-3]])
+
+
+def _stretched_exp(t: Array, q: Array) -> Array:
+    # for a trial qi, ln(-ln(q/qi)) = n ln t - n ln tau
+    pos = t > 0
+    lt = np.log(t[pos])
+    qi = q.max() * np.geomspace(1.001, 5.0, 24)[:, None]
+    n, intercept = _linfit(lt, np.log(-np.log(q[pos] / qi)))
+    return np.column_stack([qi[:, 0], np.exp(-intercept / n), n])
+
+
+def _duong(t: Array, q: Array) -> Array:
+    # for fixed m, ln q + m ln(t+1) = ln q1 + a/(1-m) * ((t+1)^(1-m) - 1) is linear
+    m = np.linspace(0.05, 0.95, 19)[:, None]
+    lt = np.log1p(t)
+    c, intercept = _linfit(np.expm1((1.0 - m) * lt), np.log(q) + m * lt)
+    m = m[:, 0]
+    return np.column_stack([np.exp(intercept), c * (1.0 - m), m])
+
+
+def _gompertz(t: Array, q: Array) -> Array:
+    # for fixed beta, ln q + beta t = ln(qmax alpha beta) - alpha exp(-beta t) is linear
+    beta = np.geomspace(1e-3, 2.0, 32)[:, None]
+    slope, intercept = _linfit(np.exp(-beta * t), np.log(q) + beta * t)
+    alpha = -slope
+    beta = beta[:, 0]
+    return np.column_stack([np.exp(intercept) / (alpha * beta), alpha, beta])
+
+
+def _logistic(t: Array, q: Array) -> Array:
+    # rate moments give t0 (mean) and k (variance = pi^2 / (3 k^2)); a (k, t0) grid
+    # covers declines that only show the falling limb
+    w = q / q.sum()
+    mean = float(np.sum(w * t))
+    sd = float(np.sqrt(np.sum(w * (t - mean) ** 2)))
+    span = max(float(t[-1] - t[0]), 1e-6)
+    k, t0 = np.meshgrid(np.geomspace(0.5, 50.0, 16) / span, np.linspace(t[0] - 2.0 * span, t[-1], 16))
+    k = np.append(k.ravel(), np.pi / (np.sqrt(3.0) * max(sd, 1e-12)))
+    t0 = np.append(t0.ravel(), mean)
+    return np.column_stack([np.full(k.size, q.sum() * span / len(q)), k, t0])
+
+
+INITIALIZERS: dict[str, Callable[[Array, Array], Array]] = {
+    "arps_exp": _arps_exp,
+    "arps_harm": _arps_harm,
+    "arps_hyp": _arps_hyp,
+    "stretched_exp": _stretched_exp,
+    "duong": _duong,
+    "gompertz": _gompertz,
+    "logistic": _logistic,
+}
+
+
+def _fallback(model: str, t: Array, q: Array) -> Array:
+    qmax = float(np.max(q)) if len(q) else 1.0
+    area = float(np.sum(np.diff(t) * (q[1:] + q[:-1]) / 2.0)) if len(q) > 1 else qmax
+    return {
+        "arps_exp": np.array([qmax, 0.1]),
+        "arps_harm": np.array([qmax, 0.1]),
+        "arps_hyp": np.array([qmax, 0.1, 0.7]),
+        "stretched_exp": np.array([qmax, 10.0, 0.8]),
+        "duong": np.array([qmax, -0.2, 0.5]),
+        "gompertz": np.array([area, 3.0, 0.1]),
+        "logistic": np.array([area, 0.1, 10.0]),
+    }[model]
+
+
+def _select(model: str, t: Array, q: Array, candidates: Array) -> Array | None:
+    """Best candidate by rate-space SSE, with the leading amplitude refit by linear least squares."""
+    lb, ub = (np.array(b) for b in MODEL_SPECS[model].bounds)
+    theta = np.clip(candidates, lb, ub)
+    theta[:, 0] = 1.0
+    ok = np.all(np.isfinite(candidates), axis=1)
+    shape = RATE_KERNELS[model](t, theta)
+    amp = shape @ q / np.maximum(np.einsum("ij,ij->i", shape, shape), 1e-300)
+    theta[:, 0] = np.clip(amp, lb[0], ub[0])
+    sse = np.sum((q - theta[:, :1] * shape) ** 2, axis=1)
+    sse = np.where(ok & (amp > 0) & np.isfinite(sse), sse, np.inf)
+    best = int(np.argmin(sse))
+    return theta[best] if np.isfinite(sse[best]) else None
+
+
+def initial_guess(model: str, t: Array, q: Array) -> dict[str, float]:
+    """Data-driven starting point for `fit_model`.
+
+    Each model is linearized (log-linear Arps, b/m/beta grids with a linear
+    solve, stretched-exponential double log, logistic moments) into a small
+    stack of candidates, scored together with one batched kernel call.
+    """
+    spec = MODEL_SPECS[model]
+    t = np.asarray(t, dtype=float)
+    q = np.asarray(q, dtype=float)
+    keep = np.isfinite(t) & np.isfinite(q) & (q > 0)
+    order = np.argsort(t[keep], kind="stable")
+    tp, qp = t[keep][order], q[keep][order]
+    if len(tp) > MAX_POINTS:
+        idx = np.linspace(0, len(tp) - 1, MAX_POINTS).round().astype(int)
+        tp, qp = tp[idx], qp[idx]
+
+    theta = None
+    if len(tp) > len(spec.param_order) and np.ptp(tp) > 0:
+        with np.errstate(all="ignore"):
+            theta = _select(model, tp, qp, INITIALIZERS[model](tp, qp))
+    if theta is None:
+        theta = np.clip(_fallback(model, tp, qp), *spec.bounds)
+    return {k: float(v) for k, v in zip(spec.param_order, theta, strict=True)}
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+import warnings
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+StageHook = Callable[[str, float, dict[str, int]], None]
+
+_lock = threading.Lock()
+_recorders: list[Recorder] = []
+_hooks: list[StageHook] = []
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0
+    counters: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class Recorder:
+    """Aggregates per-stage call counts, wall time and counters (nfev, njev, ...)."""
+
+    stages: dict[str, StageStats] = field(default_factory=dict)
+
+    def record(self, name: str, seconds: float, counters: dict[str, int]) -> None:
+        with _lock:
+            stats = self.stages.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            for key, value in counters.items():
+                stats.counters[key] = stats.counters.get(key, 0) + int(value)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {
+            name: {"calls": s.calls, "seconds": s.seconds, **s.counters}
+            for name, s in sorted(self.stages.items(), key=lambda item: -item[1].seconds)
+        }
+
+
+def add_hook(hook: StageHook) -> None:
+    """Call `hook(stage, seconds, counters)` after every instrumented stage, e.g. to export metrics."""
+    with _lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: StageHook) -> None:
+    with _lock:
+        _hooks.remove(hook)
+
+
+@contextmanager
+def profile() -> Iterator[Recorder]:
+    """Collect stage statistics from every instrumented call made inside the block.
+
+    Stages that run in worker processes are not visible to the parent recorder.
+    """
+    recorder = Recorder()
+    with _lock:
+        _recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        with _lock:
+            _recorders.remove(recorder)
+
+
+@dataclass
+class Stage:
+    name: str
+    counters: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+@contextmanager
+def stage(name: str) -> Iterator[Stage]:
+    """Time a block; counters set on the yielded `Stage` are reported with it.
+
+    A recorder or hook that raises only emits a `RuntimeWarning`.
+    """
+    current = Stage(name)
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.seconds = time.perf_counter() - start
+        if _recorders or _hooks:
+            with _lock:
+                recorders, hooks = list(_recorders), list(_hooks)
+            for report in [r.record for r in recorders] + hooks:
+                # instrumentation must never change the outcome of the timed block
+                try:
+                    report(name, current.seconds, current.counters)
+                except Exception as exc:  # noqa: BLE001
+                    warnings.warn(f"Stage hook failed for {name!r}: {exc!r}", RuntimeWarning, stacklevel=3)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+from .batch import Wells, stack_wells
+from .fit import FitOptions, _information_criteria, _loss
+from .initialize import initial_guess
+from .instrument import stage
+from .models import JAC_KERNELS, MODEL_SPECS, RATE_KERNELS
+from .types import Array
+
+
+@dataclass
+class JointFitResult:
+    """Joint fit of one model to many wells; `params` repeats the shared values in every row."""
+
+    model: str
+    shared: dict[str, float]
+    well_id: Array
+    params: Array
+    success: bool
+    loss: float
+    aic: float
+    bic: float
+    n_obs: int
+    n_params: int
+    nfev: int
+    message: str
+    wall_time: float = 0.0
+
+    def param_dict(self, i: int) -> dict[str, float]:
+        order = MODEL_SPECS[self.model].param_order
+        return {k: float(v) for k, v in zip(order, self.params[i], strict=True)}
+
+
+def fit_joint(
+    model: str,
+    wells: Wells,
+    shared: tuple[str, ...] = (),
+    initial: Mapping[str, float] | Array | None = None,
+    options: FitOptions | None = None,
+) -> JointFitResult:
+    """Fit all wells at once, with `shared` parameters common to every well.
+
+    The unknowns are the shared parameters followed by each well's remaining
+    parameters. Residuals of all wells are stacked, and the analytic Jacobian is
+    assembled as a CSR matrix with one row of k nonzeros per observation, which
+    `least_squares` solves with the sparse trust-region solver (`lsmr`). Memory
+    therefore grows with the number of observations, not observations x unknowns.
+    `initial` is a dict used for every well, an (n_wells, k) array, or None for
+    per-well `initial_guess` values (shared ones start at their median).
+    """
+    from scipy.optimize import least_squares
+    from scipy.sparse import csr_matrix
+
+    options = options or FitOptions()
+    start = time.perf_counter()
+    spec = MODEL_SPECS[model]
+    order = spec.param_order
+    k = len(order)
+    unknown = [p for p in shared if p not in order]
+    if unknown:
+        raise ValueError(f"Unknown parameters for {model}: {unknown}")
+    shared_idx = np.array([order.index(p) for p in shared], dtype=np.intp)
+    local_idx = np.array([i for i in range(k) if order[i] not in shared], dtype=np.intp)
+    s, loc = len(shared_idx), len(local_idx)
+
+    ids, t, q, bounds = stack_wells(wells)
+    m = len(ids)
+    counts = np.diff(bounds)
+    seg = np.repeat(np.arange(m), counts)
+    n = len(q)
+
+    if initial is None:
+        guesses = (initial_guess(model, t[a:b], q[a:b]) for a, b in zip(bounds[:-1], bounds[1:], strict=True))
+        theta0 = np.array([[g[p] for p in order] for g in guesses]).reshape(m, k)
+    elif isinstance(initial, Mapping):
+        theta0 = np.tile([initial[p] for p in order], (m, 1)).astype(float)
+    else:
+        theta0 = np.asarray(initial, dtype=float).reshape(m, k)
+    x0 = np.concatenate([np.median(theta0[:, shared_idx], axis=0), theta0[:, local_idx].ravel()])
+    lb, ub = np.array(spec.bounds[0]), np.array(spec.bounds[1])
+    x_lb = np.concatenate([lb[shared_idx], np.tile(lb[local_idx], m)])
+    x_ub = np.concatenate([ub[shared_idx], np.tile(ub[local_idx], m)])
+    x0 = np.clip(x0, x_lb, x_ub)
+
+    rate_fn, jac_fn = RATE_KERNELS[model], JAC_KERNELS[model]
+    tc = t[:, None]
+
+    def expand(x: Array) -> Array:
+        theta = np.empty((m, k))
+        theta[:, shared_idx] = x[:s]
+        theta[:, local_idx] = x[s:].reshape(m, loc)
+        return theta
+
+    def residuals(x: Array) -> Array:
+        return q - rate_fn(tc, expand(x)[seg])[:, 0]
+
+    # CSR layout: row j holds the shared columns, then well seg[j]'s own columns
+    cols = np.empty((n, k), dtype=np.intp)
+    cols[:, :s] = np.arange(s)
+    cols[:, s:] = s + seg[:, None] * loc + np.arange(loc)
+    indices = cols.ravel()
+    indptr = np.arange(0, n * k + 1, k)
+    perm = np.concatenate([shared_idx, local_idx])
+
+    def jacobian(x: Array) -> csr_matrix:
+        j = jac_fn(tc, expand(x)[seg])[:, 0, :]
+        return csr_matrix((-j[:, perm].ravel(), indices, indptr), shape=(n, s + m * loc))
+
+    with stage("joint.least_squares") as st, np.errstate(over="ignore", invalid="ignore"):
+        result = least_squares(
+            residuals,
+            x0,
+            jac=jacobian,
+            bounds=(x_lb, x_ub),
+            method="trf",
+            tr_solver="lsmr",
+            x_scale="jac",
+            max_nfev=options.max_nfev,
+        )
+        st.counters.update(nfev=result.nfev, njev=result.njev or 0, wells=m, unknowns=len(x0))
+
+    theta = expand(result.x)
+    qp = q - result.fun
+    rss = float(result.fun @ result.fun)
+    n_params = len(result.x)
+    aic, bic = _information_criteria(rss, n, n_params)
+    return JointFitResult(
+        model=model,
+        shared={order[i]: float(result.x[j]) for j, i in enumerate(shared_idx)},
+        well_id=ids,
+        params=theta,
+        success=bool(result.success),
+        loss=_loss(q, qp, options),
+        aic=aic,
+        bic=bic,
+        n_obs=n,
+        n_params=n_params,
+        nfev=int(result.nfev),
+        message=str(result.message),
+        wall_time=time.perf_counter() - start,
+    )
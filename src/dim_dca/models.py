@@ -4,7 +4,7 @@ from dataclasses import dataclass
 
 import numpy as np
 
-from .types import Array
+from .types import Array, KernelCallable
 
 _EPS = 1e-12
 
@@ -16,90 +16,253 @@ class ModelSpec:
     bounds: tuple[tuple[float, ...], tuple[float, ...]]
 
 
-def arps_hyperbolic_rate(t: Array, p: dict[str, float]) -> Array:
-    qi, di, b = p["qi"], p["di"], p["b"]
+# Array-native kernels. `theta` is a parameter vector (k,) in `param_order`, or a
+# matrix (m, k) of parameter sets; the result has the shape of `t` or (m, n)
+# respectively (with a trailing k axis for Jacobians).
+
+
+def _cols(theta: Array) -> tuple[Array, ...]:
+    theta = np.asarray(theta, dtype=float)
+    if theta.ndim == 1:
+        return tuple(theta)
+    return tuple(theta[..., i, None] for i in range(theta.shape[-1]))
+
+
+def _arps_hyp_rate(t: Array, theta: Array) -> Array:
+    qi, di, b = _cols(theta)
     x = 1.0 + b * di * t
     return qi / np.power(np.maximum(x, _EPS), 1.0 / np.maximum(b, _EPS))
 
 
-def arps_hyperbolic_cum(t: Array, p: dict[str, float]) -> Array:
-    qi, di, b = p["qi"], p["di"], p["b"]
-    if abs(b - 1.0) < 1e-7:
-        return (qi / di) * np.log1p(di * t)
-    one_minus_b = 1.0 - b
-    return (qi / ((1.0 - b) * di)) * (1.0 - np.power(1.0 + b * di * t, -one_minus_b / b))
+def _arps_hyp_jac(t: Array, theta: Array) -> Array:
+    qi, di, b = _cols(theta)
+    x = np.maximum(1.0 + b * di * t, _EPS)
+    base = np.power(x, -1.0 / b)
+    q = qi * base
+    return np.stack([base, -q * t / x, q * (np.log(x) / b**2 - di * t / (b * x))], axis=-1)
 
 
-def arps_exponential_rate(t: Array, p: dict[str, float]) -> Array:
-    qi, di = p["qi"], p["di"]
+def _arps_hyp_cum(t: Array, theta: Array) -> Array:
+    qi, di, b = _cols(theta)
+    harmonic = np.abs(b - 1.0) < 1e-7
+    one_minus_b = np.where(harmonic, 1.0, 1.0 - b)
+    hyp = (qi / (one_minus_b * di)) * (1.0 - np.power(1.0 + b * di * t, -one_minus_b / b))
+    return np.where(harmonic, (qi / di) * np.log1p(di * t), hyp)
+
+
+def _arps_exp_rate(t: Array, theta: Array) -> Array:
+    qi, di = _cols(theta)
     return qi * np.exp(-di * t)
 
 
-def arps_exponential_cum(t: Array, p: dict[str, float]) -> Array:
-    qi, di = p["qi"], p["di"]
+def _arps_exp_jac(t: Array, theta: Array) -> Array:
+    qi, di = _cols(theta)
+    e = np.exp(-di * t)
+    return np.stack([e, -qi * t * e], axis=-1)
+
+
+def _arps_exp_cum(t: Array, theta: Array) -> Array:
+    qi, di = _cols(theta)
     return (qi / di) * (1.0 - np.exp(-di * t))
 
 
-def arps_harmonic_rate(t: Array, p: dict[str, float]) -> Array:
-    qi, di = p["qi"], p["di"]
+def _arps_harm_rate(t: Array, theta: Array) -> Array:
+    qi, di = _cols(theta)
     return qi / np.maximum(1.0 + di * t, _EPS)
 
 
-def arps_harmonic_cum(t: Array, p: dict[str, float]) -> Array:
-    qi, di = p["qi"], p["di"]
+def _arps_harm_jac(t: Array, theta: Array) -> Array:
+    qi, di = _cols(theta)
+    x = np.maximum(1.0 + di * t, _EPS)
+    return np.stack([1.0 / x, -qi * t / x**2], axis=-1)
+
+
+def _arps_harm_cum(t: Array, theta: Array) -> Array:
+    qi, di = _cols(theta)
     return (qi / di) * np.log1p(di * t)
 
 
-def stretched_exponential_rate(t: Array, p: dict[str, float]) -> Array:
-    qi, tau, n = p["qi"], p["tau"], p["n"]
+def _stretched_exp_rate(t: Array, theta: Array) -> Array:
+    qi, tau, n = _cols(theta)
     x = np.maximum(t / np.maximum(tau, _EPS), 0.0)
     return qi * np.exp(-np.power(x, n))
 
 
-def stretched_exponential_cum(t: Array, p: dict[str, float]) -> Array:
-    qi, tau, n = p["qi"], p["tau"], p["n"]
-    # numerical quadrature via trapz on dense local grid for stability
-    tt = np.linspace(0.0, float(np.max(t)), 400)
-    qt = stretched_exponential_rate(tt, p)
-    cum = np.cumsum((qt[1:] + qt[:-1]) * np.diff(tt) * 0.5)
-    cum = np.insert(cum, 0, 0.0)
-    return np.interp(t, tt, cum)
+def _stretched_exp_jac(t: Array, theta: Array) -> Array:
+    qi, tau, n = _cols(theta)
+    x = np.maximum(t / np.maximum(tau, _EPS), 0.0)
+    xn = np.power(x, n)
+    e = np.exp(-xn)
+    logx = np.log(np.where(x > 0.0, x, 1.0))
+    return np.stack([e, qi * e * n * xn / tau, -qi * e * xn * logx], axis=-1)
 
 
-def duong_rate(t: Array, p: dict[str, float]) -> Array:
-    q1, a, m = p["q1"], p["a"], p["m"]
+def _stretched_exp_cum(t: Array, theta: Array) -> Array:
+    from scipy.special import gamma, gammainc
+
+    qi, tau, n = _cols(theta)
+    # int_0^t qi exp(-(s/tau)^n) ds = qi tau / n * lower_gamma(1/n, (t/tau)^n)
+    x = np.maximum(t / np.maximum(tau, _EPS), 0.0)
+    return qi * tau * gamma(1.0 + 1.0 / n) * gammainc(1.0 / n, np.power(x, n))
+
+
+def _duong_rate(t: Array, theta: Array) -> Array:
+    q1, a, m = _cols(theta)
     tp1 = np.maximum(t + 1.0, _EPS)
     return q1 * np.power(tp1, -m) * np.exp((a / (1.0 - m)) * (np.power(tp1, 1.0 - m) - 1.0))
 
 
+def _duong_jac(t: Array, theta: Array) -> Array:
+    q1, a, m = _cols(theta)
+    tp1 = np.maximum(t + 1.0, _EPS)
+    lt = np.log(tp1)
+    u = np.power(tp1, 1.0 - m)
+    base = np.power(tp1, -m) * np.exp((a / (1.0 - m)) * (u - 1.0))
+    q = q1 * base
+    dm = -lt + a * (u - 1.0) / (1.0 - m) ** 2 - a * lt * u / (1.0 - m)
+    return np.stack([base, q * (u - 1.0) / (1.0 - m), q * dm], axis=-1)
+
+
+def _duong_cum(t: Array, theta: Array) -> Array:
+    from scipy.special import exprel
+
+    q1, a, m = _cols(theta)
+    # substituting u = (t+1)^(1-m) gives q1/(1-m) * int_0^s exp(c u) du with c = a/(1-m)
+    s = np.power(np.maximum(t + 1.0, _EPS), 1.0 - m) - 1.0
+    return (q1 / (1.0 - m)) * s * exprel((a / (1.0 - m)) * s)
+
+
+def _gompertz_rate(t: Array, theta: Array) -> Array:
+    # d/dt [qmax exp(-alpha g)] with g = exp(-beta t)
+    qmax, alpha, beta = _cols(theta)
+    g = np.exp(-beta * t)
+    return qmax * alpha * beta * g * np.exp(-alpha * g)
+
+
+def _gompertz_jac(t: Array, theta: Array) -> Array:
+    qmax, alpha, beta = _cols(theta)
+    g = np.exp(-beta * t)
+    c = g * np.exp(-alpha * g)
+    return np.stack(
+        [alpha * beta * c, qmax * beta * c * (1.0 - alpha * g), qmax * alpha * c * (1.0 + beta * t * (alpha * g - 1.0))],
+        axis=-1,
+    )
+
+
+def _gompertz_cum(t: Array, theta: Array) -> Array:
+    qmax, alpha, beta = _cols(theta)
+    return qmax * np.exp(-alpha * np.exp(-beta * t))
+
+
+def _logistic_rate(t: Array, theta: Array) -> Array:
+    qmax, k, t0 = _cols(theta)
+    # e / (1 + e)^2 with e = exp(-z) written as sech^2(z / 2) / 4 to avoid overflow
+    s = 0.25 / np.cosh(0.5 * k * (t - t0)) ** 2
+    return qmax * k * s
+
+
+def _logistic_jac(t: Array, theta: Array) -> Array:
+    qmax, k, t0 = _cols(theta)
+    half = 0.5 * k * (t - t0)
+    s = 0.25 / np.cosh(half) ** 2
+    th = np.tanh(half)
+    return np.stack([k * s, qmax * s * (1.0 - k * (t - t0) * th), qmax * k**2 * s * th], axis=-1)
+
+
+def _logistic_cum(t: Array, theta: Array) -> Array:
+    qmax, k, t0 = _cols(theta)
+    return 0.5 * qmax * (1.0 + np.tanh(0.5 * k * (t - t0)))
+
+
+# Dict-parameter API: thin wrappers over the kernels above.
+
+
+def _theta(p: dict[str, float], model: str) -> Array:
+    return np.array([p[k] for k in MODEL_SPECS[model].param_order], dtype=float)
+
+
+def arps_hyperbolic_rate(t: Array, p: dict[str, float]) -> Array:
+    return _arps_hyp_rate(t, _theta(p, "arps_hyp"))
+
+
+def arps_hyperbolic_jac(t: Array, p: dict[str, float]) -> Array:
+    return _arps_hyp_jac(t, _theta(p, "arps_hyp"))
+
+
+def arps_hyperbolic_cum(t: Array, p: dict[str, float]) -> Array:
+    return _arps_hyp_cum(t, _theta(p, "arps_hyp"))
+
+
+def arps_exponential_rate(t: Array, p: dict[str, float]) -> Array:
+    return _arps_exp_rate(t, _theta(p, "arps_exp"))
+
+
+def arps_exponential_jac(t: Array, p: dict[str, float]) -> Array:
+    return _arps_exp_jac(t, _theta(p, "arps_exp"))
+
+
+def arps_exponential_cum(t: Array, p: dict[str, float]) -> Array:
+    return _arps_exp_cum(t, _theta(p, "arps_exp"))
+
+
+def arps_harmonic_rate(t: Array, p: dict[str, float]) -> Array:
+    return _arps_harm_rate(t, _theta(p, "arps_harm"))
+
+
+def arps_harmonic_jac(t: Array, p: dict[str, float]) -> Array:
+    return _arps_harm_jac(t, _theta(p, "arps_harm"))
+
+
+def arps_harmonic_cum(t: Array, p: dict[str, float]) -> Array:
+    return _arps_harm_cum(t, _theta(p, "arps_harm"))
+
+
+def stretched_exponential_rate(t: Array, p: dict[str, float]) -> Array:
+    return _stretched_exp_rate(t, _theta(p, "stretched_exp"))
+
+
+def stretched_exponential_jac(t: Array, p: dict[str, float]) -> Array:
+    return _stretched_exp_jac(t, _theta(p, "stretched_exp"))
+
+
+def stretched_exponential_cum(t: Array, p: dict[str, float]) -> Array:
+    return _stretched_exp_cum(t, _theta(p, "stretched_exp"))
+
+
+def duong_rate(t: Array, p: dict[str, float]) -> Array:
+    return _duong_rate(t, _theta(p, "duong"))
+
+
+def duong_jac(t: Array, p: dict[str, float]) -> Array:
+    return _duong_jac(t, _theta(p, "duong"))
+
+
 def duong_cum(t: Array, p: dict[str, float]) -> Array:
-    tt = np.linspace(0.0, float(np.max(t)), 500)
-    qt = duong_rate(tt, p)
-    cum = np.cumsum((qt[1:] + qt[:-1]) * np.diff(tt) * 0.5)
-    cum = np.insert(cum, 0, 0.0)
-    return np.interp(t, tt, cum)
+    return _duong_cum(t, _theta(p, "duong"))
 
 
 def gompertz_rate(t: Array, p: dict[str, float]) -> Array:
-    qmax, alpha, beta = p["qmax"], p["alpha"], p["beta"]
-    cum = qmax * np.exp(-alpha * np.exp(-beta * t))
-    return np.gradient(cum, t, edge_order=2)
+    return _gompertz_rate(t, _theta(p, "gompertz"))
+
+
+def gompertz_jac(t: Array, p: dict[str, float]) -> Array:
+    return _gompertz_jac(t, _theta(p, "gompertz"))
 
 
 def gompertz_cum(t: Array, p: dict[str, float]) -> Array:
-    qmax, alpha, beta = p["qmax"], p["alpha"], p["beta"]
-    return qmax * np.exp(-alpha * np.exp(-beta * t))
+    return _gompertz_cum(t, _theta(p, "gompertz"))
 
 
 def logistic_rate(t: Array, p: dict[str, float]) -> Array:
-    qmax, k, t0 = p["qmax"], p["k"], p["t0"]
-    e = np.exp(-k * (t - t0))
-    return (qmax * k * e) / np.power(1.0 + e, 2)
+    return _logistic_rate(t, _theta(p, "logistic"))
+
+
+def logistic_jac(t: Array, p: dict[str, float]) -> Array:
+    return _logistic_jac(t, _theta(p, "logistic"))
 
 
 def logistic_cum(t: Array, p: dict[str, float]) -> Array:
-    qmax, k, t0 = p["qmax"], p["k"], p["t0"]
-    return qmax / (1.0 + np.exp(-k * (t - t0)))
+    return _logistic_cum(t, _theta(p, "logistic"))
 
 
 def dimensionless_time(t: Array, di: float) -> Array:
@@ -139,3 +302,43 @@ CUM_FUNCS = {
     "gompertz": gompertz_cum,
     "logistic": logistic_cum,
 }
+
+JAC_FUNCS = {
+    "arps_exp": arps_exponential_jac,
+    "arps_harm": arps_harmonic_jac,
+    "arps_hyp": arps_hyperbolic_jac,
+    "stretched_exp": stretched_exponential_jac,
+    "duong": duong_jac,
+    "gompertz": gompertz_jac,
+    "logistic": logistic_jac,
+}
+
+RATE_KERNELS: dict[str, KernelCallable] = {
+    "arps_exp": _arps_exp_rate,
+    "arps_harm": _arps_harm_rate,
+    "arps_hyp": _arps_hyp_rate,
+    "stretched_exp": _stretched_exp_rate,
+    "duong": _duong_rate,
+    "gompertz": _gompertz_rate,
+    "logistic": _logistic_rate,
+}
+
+CUM_KERNELS: dict[str, KernelCallable] = {
+    "arps_exp": _arps_exp_cum,
+    "arps_harm": _arps_harm_cum,
+    "arps_hyp": _arps_hyp_cum,
+    "stretched_exp": _stretched_exp_cum,
+    "duong": _duong_cum,
+    "gompertz": _gompertz_cum,
+    "logistic": _logistic_cum,
+}
+
+JAC_KERNELS: dict[str, KernelCallable] = {
+    "arps_exp": _arps_exp_jac,
+    "arps_harm": _arps_harm_jac,
+    "arps_hyp": _arps_hyp_jac,
+    "stretched_exp": _stretched_exp_jac,
+    "duong": _duong_jac,
+    "gompertz": _gompertz_jac,
+    "logistic": _logistic_jac,
+}
@@ -17,6 +17,11 @@ def ls_loss(y_true: Array, y_pred: Array, weights: Array | None = None) -> float
     return 0.5 * float(np.dot(r, r))
 
 
+def ls_loss_batch(y_true: Array, y_pred: Array) -> Array:
+    r = y_true - y_pred
+    return 0.5 * np.einsum("...i,...i->...", r, r)
+
+
 def huber_loss(y_true: Array, y_pred: Array, delta: float = 1.0) -> float:
     r = y_true - y_pred
     abs_r = np.abs(r)
@@ -25,6 +30,13 @@ def huber_loss(y_true: Array, y_pred: Array, delta: float = 1.0) -> float:
     return float(np.sum(0.5 * quad**2 + delta * lin))
 
 
+def huber_loss_batch(y_true: Array, y_pred: Array, delta: float = 1.0) -> Array:
+    abs_r = np.abs(y_true - y_pred)
+    quad = np.minimum(abs_r, delta)
+    lin = abs_r - quad
+    return np.sum(0.5 * quad**2 + delta * lin, axis=-1)
+
+
 def gaussian_nll(y_true: Array, y_pred: Array, sigma: float) -> float:
     r = y_true - y_pred
     n = y_true.size
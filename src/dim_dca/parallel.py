@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Any
+
+BACKENDS = ("serial", "thread", "process")
+
+
+def make_executor(backend: str, n_jobs: int | None = None) -> Executor | None:
+    if backend == "serial":
+        return None
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=n_jobs)
+    if backend == "process":
+        return ProcessPoolExecutor(max_workers=n_jobs)
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def run_tasks(
+    fn: Callable[..., Any],
+    tasks: Sequence[tuple],
+    backend: str = "serial",
+    n_jobs: int | None = None,
+) -> list[Any]:
+    """Evaluate `fn(*task)` for every task; results keep the task order.
+
+    The process backend requires `fn` and the task arguments to be picklable.
+    """
+    if backend == "serial" or len(tasks) <= 1:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        return [fn(*task) for task in tasks]
+    with make_executor(backend, n_jobs) as executor:
+        return list(executor.map(fn, *zip(*tasks, strict=True)))
+
+
+def imap_tasks(
+    fn: Callable[..., Any],
+    tasks: Iterable[tuple],
+    backend: str = "serial",
+    n_jobs: int | None = None,
+    max_pending: int | None = None,
+) -> Iterator[Any]:
+    """Yield `fn(*task)` results in completion order, pulling tasks lazily.
+
+    At most `max_pending` tasks (default: twice the worker count) are in flight,
+    so neither the task stream nor the results are materialized.
+    """
+    if backend == "serial":
+        for task in tasks:
+            yield fn(*task)
+        return
+    limit = max_pending or 2 * (n_jobs or os.cpu_count() or 1)
+    with make_executor(backend, n_jobs) as executor:
+        pending: set[Future] = set()
+        for task in tasks:
+            pending.add(executor.submit(fn, *task))
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .compare import compare_models
+from .data import stream_wells
+from .fit import fit_model
+from .forecast import EXCEEDANCE, forecast
+from .models import MODEL_SPECS
+from .parallel import imap_tasks
+from .types import Array, FitResult
+from .uncertainty import bootstrap_samples, param_ci
+
+
+@dataclass(frozen=True)
+class WellJob:
+    """Settings shared by every well of a field run."""
+
+    model: str = "arps_hyp"
+    models: tuple[str, ...] = tuple(MODEL_SPECS)
+    screen: int | None = None
+    horizon: float = 360.0
+    q_limit: float = 0.0
+    n_boot: int = 200
+    method: str = "residual"
+    alpha: float = 0.1
+
+
+def _fit_fields(fit: FitResult) -> dict:
+    return {
+        "model": fit.model,
+        "params": fit.params,
+        "success": fit.success,
+        "loss": fit.loss,
+        "aic": fit.aic,
+        "bic": fit.bic,
+        "nfev": fit.nfev,
+    }
+
+
+def _fit(t: Array, q: Array, job: WellJob) -> FitResult:
+    return fit_model(job.model, t, q)
+
+
+def _fit_well(t: Array, q: Array, job: WellJob) -> dict:
+    return _fit_fields(_fit(t, q, job))
+
+
+def _compare_well(t: Array, q: Array, job: WellJob) -> dict:
+    rows = compare_models(list(job.models), t, q, screen=job.screen)
+    keys = ("model", "params", "success", "aic", "bic", "cv_rmse") + (("pruned_at",) if job.screen is not None else ())
+    ranking = [{k: r[k] for k in keys} for r in rows]
+    return {"best": ranking[0]["model"], "ranking": ranking}
+
+
+def _forecast_well(t: Array, q: Array, job: WellJob) -> dict:
+    fit = _fit(t, q, job)
+    fc = forecast(job.model, fit.params, np.array([0.0, job.horizon]), q_limit=job.q_limit, curves=False)
+    return {**_fit_fields(fit), "eur": float(fc.eur[0]), "t_limit": float(fc.t_limit[0]), "reached": bool(fc.reached[0])}
+
+
+def _uncertainty_well(t: Array, q: Array, job: WellJob) -> dict:
+    fit = _fit(t, q, job)
+    samples = bootstrap_samples(job.model, t, q, fit.params, n_boot=job.n_boot, method=job.method)
+    fc = forecast(job.model, samples, np.array([0.0, job.horizon]), q_limit=job.q_limit, curves=False)
+    eur = {name: float(np.quantile(fc.eur, p)) for name, p in EXCEEDANCE.items()} if len(samples) else {}
+    return {
+        **_fit_fields(fit),
+        "n_boot": len(samples),
+        "ci": param_ci(samples, job.alpha, names=MODEL_SPECS[job.model].param_order),
+        "eur": eur,
+    }
+
+
+WELL_COMMANDS: dict[str, Callable[[Array, Array, WellJob], dict]] = {
+    "fit": _fit_well,
+    "compare": _compare_well,
+    "forecast": _forecast_well,
+    "uncertainty": _uncertainty_well,
+}
+
+# Parquet column types (pyarrow type names) of each command's records; nested
+# values are stored as JSON strings. well_id, n_obs and error are added to all.
+_FIT_COLUMNS = (
+    ("model", "string"),
+    ("params", "string"),
+    ("success", "bool_"),
+    ("loss", "float64"),
+    ("aic", "float64"),
+    ("bic", "float64"),
+    ("nfev", "int64"),
+)
+RECORD_COLUMNS: dict[str, tuple[tuple[str, str], ...]] = {
+    "fit": _FIT_COLUMNS,
+    "compare": (("best", "string"), ("ranking", "string")),
+    "forecast": _FIT_COLUMNS + (("eur", "float64"), ("t_limit", "float64"), ("reached", "bool_")),
+    "uncertainty": _FIT_COLUMNS + (("n_boot", "int64"), ("ci", "string"), ("eur", "string")),
+}
+
+
+def run_well(command: str, well_id: object, t: Array, q: Array, job: WellJob) -> dict:
+    """One output record; a failing well is recorded with its error instead of aborting the run."""
+    try:
+        record = WELL_COMMANDS[command](t, q, job)
+    except Exception as exc:  # noqa: BLE001 - one bad well must not stop a field run
+        record = {"error": f"{type(exc).__name__}: {exc}"}
+    return {"well_id": well_id, "n_obs": len(q), **record}
+
+
+def json_default(obj: object) -> object:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _is_parquet(path: Path) -> bool:
+    return path.suffix in (".parquet", ".pq")
+
+
+class JsonlSink:
+    """Appends one JSON line per well and flushes it, so a killed run loses at most one torn line."""
+
+    def __init__(self, path: Path) -> None:
+        self._f = path.open("a", encoding="utf-8")
+
+    def write(self, record: dict) -> None:
+        self._f.write(json.dumps(record, default=json_default) + "\n")
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class ParquetSink:
+    """Writes every `batch_size` records as a new `part-NNNNN.parquet` file in the `path` directory.
+
+    Each part is written to a temporary name and renamed when complete, so an
+    interrupted run loses at most one unwritten batch. Every part has the
+    command's fixed schema (`RECORD_COLUMNS` plus a nullable `error`); nested
+    fields (params, rankings, intervals) are stored as JSON strings. Integer
+    well ids stay integers, any other id is written as a string.
+    """
+
+    def __init__(self, path: Path, command: str, batch_size: int = 256) -> None:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise ImportError("Writing Parquet output requires pyarrow") from exc
+        path.mkdir(parents=True, exist_ok=True)
+        self._dir = path
+        self._batch_size = batch_size
+        self._columns = RECORD_COLUMNS[command]
+        self._schema = None
+        self._buffer: list[dict] = []
+        self._index = len(list(path.glob("part-*.parquet")))
+
+    def write(self, record: dict) -> None:
+        flat = {}
+        for key, value in record.items():
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, default=json_default)
+            flat[key] = value.item() if isinstance(value, np.generic) else value
+        if not isinstance(flat["well_id"], int):
+            flat["well_id"] = str(flat["well_id"])
+        self._buffer.append(flat)
+        if len(self._buffer) >= self._batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffer:
+            return
+        if self._schema is None:
+            id_type = pa.int64() if isinstance(self._buffer[0]["well_id"], int) else pa.string()
+            columns = [("n_obs", "int64"), *self._columns, ("error", "string")]
+            self._schema = pa.schema([("well_id", id_type)] + [(k, getattr(pa, v)()) for k, v in columns])
+        part = self._dir / f"part-{self._index:05d}.parquet"
+        tmp = part.with_suffix(".tmp")
+        pq.write_table(pa.Table.from_pylist(self._buffer, schema=self._schema), tmp)
+        os.replace(tmp, part)
+        self._index += 1
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self._flush()
+
+
+def completed_wells(path: str | Path) -> set[object]:
+    """Well ids with a successful record in a JSONL file or Parquet part directory.
+
+    Error records are not counted, so a resumed run retries those wells and
+    appends a new record after the error. A torn final JSONL line left by an
+    interrupted run is truncated away.
+    """
+    p = Path(path)
+    if not p.exists():
+        return set()
+    if _is_parquet(p):
+        import pyarrow.parquet as pq
+
+        done: set[object] = set()
+        for part in sorted(p.glob("part-*.parquet")):
+            rows = pq.read_table(part, columns=["well_id", "error"]).to_pylist()
+            done.update(r["well_id"] for r in rows if r["error"] is None)
+        return done
+    done = set()
+    good = 0
+    with p.open("rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+                well_id = record["well_id"]
+            except (ValueError, KeyError):
+                break
+            if "error" not in record:
+                done.add(well_id)
+            good += len(line)
+    if good != p.stat().st_size:
+        with p.open("r+b") as f:
+            f.truncate(good)
+    return done
+
+
+def run_field(
+    command: str,
+    path: str | Path,
+    output: str | Path,
+    job: WellJob = WellJob(),
+    n_jobs: int = 1,
+    chunksize: int = 100_000,
+    columns: tuple[str, str, str] = ("well_id", "time", "rate"),
+) -> int:
+    """Run `command` for every well of a long-format file, streaming records to `output`.
+
+    Output is JSONL, or a directory of Parquet parts when `output` ends in
+    `.parquet`. Wells already in `output` are skipped, so an interrupted run can
+    simply be restarted; wells recorded with an error are tried again. Returns the number of wells processed by this call.
+    """
+    if command not in WELL_COMMANDS:
+        raise ValueError(f"Unknown command: {command}")
+    out = Path(output)
+    done = completed_wells(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    def tasks() -> Iterator[tuple]:
+        for wid, t, q in stream_wells(path, *columns, chunksize=chunksize):
+            if wid not in done:
+                yield command, wid, t, q, job
+
+    backend = "process" if n_jobs > 1 else "serial"
+    sink = ParquetSink(out, command) if _is_parquet(out) else JsonlSink(out)
+    n = 0
+    try:
+        for record in imap_tasks(run_well, tasks(), backend=backend, n_jobs=n_jobs):
+            sink.write(record)
+            n += 1
+    finally:
+        sink.close()
+    return n
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from concurrent.futures import Executor
+from dataclasses import astuple, dataclass, field
+
+import numpy as np
+
+from .batch import fit_many
+from .compare import compare_models
+from .fit import FitOptions, _pack
+from .initialize import initial_guess
+from .models import MODEL_SPECS
+from .parallel import make_executor
+from .types import Array, FitResult
+
+Initial = Mapping[str, float] | None
+
+
+def _fit_batch(
+    model: str,
+    series: list[tuple[Array, Array]],
+    initials: list[Initial],
+    options: FitOptions,
+) -> list[FitResult | Exception]:
+    """Worker side of one coalesced batch; missing initials are guessed per well.
+
+    If the batched fit fails, every well is refit on its own, so an error is
+    returned only in the row of the well that raised it.
+    """
+    order = MODEL_SPECS[model].param_order
+
+    def run(items: list[tuple[int, Array, Array]], inits: list[Initial]) -> list[FitResult]:
+        initial = None
+        if any(init is not None for init in inits):
+            initial = np.array(
+                [
+                    _pack(init if init is not None else initial_guess(model, t, q), order)
+                    for init, (_, t, q) in zip(inits, items, strict=True)
+                ]
+            )
+        table = fit_many(model, items, initial, options)
+        return [table.row(i) for i in range(len(table))]
+
+    items = [(i, t, q) for i, (t, q) in enumerate(series)]
+    try:
+        return run(items, initials)
+    except Exception:  # noqa: BLE001 - isolate the failing well below
+        pass
+    out: list[FitResult | Exception] = []
+    for item, init in zip(items, initials, strict=True):
+        try:
+            out.extend(run([item], [init]))
+        except Exception as exc:  # noqa: BLE001 - one bad request must not fail its batch
+            out.append(exc)
+    return out
+
+
+def _check_series(t: Array, q: Array) -> tuple[Array, Array]:
+    t = np.asarray(t, dtype=float)
+    q = np.asarray(q, dtype=float)
+    if t.ndim != 1 or t.shape != q.shape:
+        raise ValueError(f"t and q must be 1-D and of equal length, got {t.shape} and {q.shape}")
+    if len(t) == 0 or not (np.all(np.isfinite(t)) and np.all(np.isfinite(q))):
+        raise ValueError("t and q must be non-empty and finite")
+    return t, q
+
+
+def _compare_task(
+    models: list[str],
+    t: Array,
+    q: Array,
+    initials: dict[str, dict[str, float]] | None,
+    screen: int | None,
+) -> list[dict]:
+    return compare_models(models, t, q, initials, screen=screen)
+
+
+def _resolve(done: asyncio.Future, futures: list[asyncio.Future]) -> None:
+    """Hand row i of a finished batch to request i, skipping requests that timed out."""
+    for i, future in enumerate(futures):
+        if future.done():
+            continue
+        if done.cancelled():
+            future.cancel()
+        elif done.exception() is not None:
+            future.set_exception(done.exception())
+        elif isinstance(row := done.result()[i], Exception):
+            future.set_exception(row)
+        else:
+            future.set_result(row)
+
+
+@dataclass
+class _Pending:
+    options: FitOptions
+    futures: list[asyncio.Future] = field(default_factory=list)
+    series: list[tuple[Array, Array]] = field(default_factory=list)
+    initials: list[Initial] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class FitService:
+    """asyncio front end that runs fits on a shared worker pool.
+
+    `fit_async` calls for the same model and options that arrive within
+    `batch_window` seconds are coalesced into one `fit_many` call of at most
+    `max_batch` wells, so many small requests share a worker instead of queueing
+    one by one. `compare_async` runs `compare_models` as its own pool task. At
+    most `max_pending` requests are admitted at once; later callers wait for a
+    slot. Series are validated before joining a batch, and a well that still
+    fails in the worker fails only its own request. A `timeout` covers both the
+    wait and the fit; a request that times out before its batch is dispatched is
+    dropped from it, but work already running in a worker is not interrupted.
+
+    `backend` is `thread` or `process` (`make_executor`); use it as
+    `async with FitService(...) as service:` or call `close()`.
+    """
+
+    def __init__(
+        self,
+        backend: str = "process",
+        n_jobs: int | None = None,
+        max_batch: int = 16,
+        batch_window: float = 0.005,
+        max_pending: int = 1024,
+    ) -> None:
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._executor: Executor | None = make_executor(backend, n_jobs)
+        self._slots = asyncio.Semaphore(max_pending)
+        self._pending: dict[tuple, _Pending] = {}
+        self._running: set[asyncio.Future] = set()
+        self.batches = 0
+
+    async def __aenter__(self) -> FitService:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Flush queued batches, wait for running work and shut the pool down."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    async def fit_async(
+        self,
+        model: str,
+        t: Array,
+        q: Array,
+        initial: Mapping[str, float] | None = None,
+        options: FitOptions | None = None,
+        timeout: float | None = None,
+    ) -> FitResult:
+        """`fit_model` via a batched `fit_many`; the result has no optimizer message."""
+        if model not in MODEL_SPECS:
+            raise ValueError(f"Unknown model: {model}")
+        options = options or FitOptions()
+        series = _check_series(t, q)
+        return await asyncio.wait_for(self._fit(model, options, series, initial), timeout)
+
+    async def compare_async(
+        self,
+        models: list[str],
+        t: Array,
+        q: Array,
+        initials: dict[str, dict[str, float]] | None = None,
+        screen: int | None = None,
+        timeout: float | None = None,
+    ) -> list[dict]:
+        return await asyncio.wait_for(self._compare(models, t, q, initials, screen), timeout)
+
+    async def _fit(
+        self, model: str, options: FitOptions, series: tuple[Array, Array], initial: Initial
+    ) -> FitResult:
+        async with self._slots:
+            future = asyncio.get_running_loop().create_future()
+            key = (model, astuple(options))
+            if key not in self._pending:
+                self._pending[key] = _Pending(options)
+            pending = self._pending[key]
+            pending.futures.append(future)
+            pending.series.append(series)
+            pending.initials.append(initial)
+            if len(pending.futures) >= self.max_batch:
+                self._flush(key)
+            elif pending.timer is None:
+                loop = asyncio.get_running_loop()
+                pending.timer = loop.call_later(self.batch_window, self._flush, key)
+            return await future
+
+    async def _compare(
+        self,
+        models: list[str],
+        t: Array,
+        q: Array,
+        initials: dict[str, dict[str, float]] | None,
+        screen: int | None,
+    ) -> list[dict]:
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            task = loop.run_in_executor(
+                self._executor, _compare_task, models, t, q, initials, screen
+            )
+            self._track(task)
+            return await task
+
+    def _flush(self, key: tuple) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        live = [i for i, f in enumerate(pending.futures) if not f.done()]
+        if not live:
+            return
+        futures = [pending.futures[i] for i in live]
+        series = [pending.series[i] for i in live]
+        initials = [pending.initials[i] for i in live]
+        self.batches += 1
+        task = asyncio.get_running_loop().run_in_executor(
+            self._executor, _fit_batch, key[0], series, initials, pending.options
+        )
+        self._track(task)
+        task.add_done_callback(lambda done: _resolve(done, futures))
+
+    def _track(self, task: asyncio.Future) -> None:
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import numpy as np
+
+from .models import MODEL_SPECS
+from .types import Array, FitResult
+
+FLAG_COVARIANCE = 1  # a finite covariance is stored
+FLAG_AT_BOUND = 2  # at least one parameter sits on its bound
+FLAG_GLOBAL_SEARCH = 4  # the fit was seeded by differential evolution
+
+# object columns stored on disk as uint8 codes plus a name list
+_CATEGORICAL = ("model", "objective")
+_FORMAT_VERSION = 1
+
+
+def packed_size(k: int) -> int:
+    return k * (k + 1) // 2
+
+
+def pack_covariance(cov: Array) -> Array:
+    """Upper triangle (row-major) of (..., k, k) covariances as (..., k(k+1)/2)."""
+    iu = np.triu_indices(cov.shape[-1])
+    return cov[..., iu[0], iu[1]]
+
+
+def unpack_covariance(packed: Array, k: int) -> Array:
+    iu = np.triu_indices(k)
+    out = np.empty(packed.shape[:-1] + (k, k))
+    out[..., iu[0], iu[1]] = packed
+    out[..., iu[1], iu[0]] = packed
+    return out
+
+
+def fit_flags(model: str, theta: Array, covariance: Array | None, global_search: bool = False) -> int:
+    lb, ub = MODEL_SPECS[model].bounds
+    flags = 0
+    if covariance is not None and np.all(np.isfinite(covariance)):
+        flags |= FLAG_COVARIANCE
+    tol = 1e-8 * np.maximum(np.abs(ub), 1.0)
+    if np.any(theta - np.array(lb) <= tol) or np.any(np.array(ub) - theta <= tol):
+        flags |= FLAG_AT_BOUND
+    if global_search:
+        flags |= FLAG_GLOBAL_SEARCH
+    return flags
+
+
+def _id_array(values: Array) -> Array:
+    arr = np.asarray(list(values))
+    return arr if arr.dtype.kind in "iuU" else arr.astype(str)
+
+
+@dataclass(slots=True)
+class FitTable:
+    """Columnar fit results, one row per (well, model).
+
+    `params` is (n, k_max) in each row's `param_order`, NaN-padded, and
+    `covariance` holds the packed upper triangle of the k_max x k_max
+    covariance (NaN where unavailable). Optimizer messages are not kept;
+    `flags` records covariance availability, parameters at bounds and global
+    search (`FLAG_*`).
+    """
+
+    well_id: Array
+    model: Array
+    objective: Array
+    params: Array
+    n_params: Array
+    success: Array
+    loss: Array
+    aic: Array
+    bic: Array
+    n_obs: Array
+    nfev: Array
+    flags: Array
+    covariance: Array
+
+    def __len__(self) -> int:
+        return len(self.well_id)
+
+    def param_dict(self, i: int) -> dict[str, float]:
+        order = MODEL_SPECS[str(self.model[i])].param_order
+        return {k: float(v) for k, v in zip(order, self.params[i, : len(order)], strict=True)}
+
+    def covariance_matrix(self, i: int) -> Array | None:
+        if not self.flags[i] & FLAG_COVARIANCE:
+            return None
+        k = int(self.n_params[i])
+        return unpack_covariance(np.asarray(self.covariance[i]), self.params.shape[1])[:k, :k]
+
+    def row(self, i: int) -> FitResult:
+        """Materialize row `i` as a `FitResult` (message, njev and timings are not stored)."""
+        return FitResult(
+            model=str(self.model[i]),
+            params=self.param_dict(i),
+            success=bool(self.success[i]),
+            objective=str(self.objective[i]),
+            loss=float(self.loss[i]),
+            aic=float(self.aic[i]),
+            bic=float(self.bic[i]),
+            covariance=self.covariance_matrix(i),
+            message="",
+            n_obs=int(self.n_obs[i]),
+            n_params=int(self.n_params[i]),
+            nfev=int(self.nfev[i]),
+        )
+
+    def take(self, index: Array | slice) -> FitTable:
+        return FitTable(**{f.name: getattr(self, f.name)[index] for f in fields(self)})
+
+    @classmethod
+    def from_results(cls, results: Sequence[FitResult], well_ids: Sequence[object] | None = None) -> FitTable:
+        m = len(results)
+        k_max = max((r.n_params for r in results), default=0)
+        params = np.full((m, k_max), np.nan)
+        cov = np.full((m, k_max, k_max), np.nan)
+        flags = np.zeros(m, dtype=np.uint8)
+        for i, r in enumerate(results):
+            theta = np.array([r.params[k] for k in MODEL_SPECS[r.model].param_order])
+            params[i, : theta.size] = theta
+            if r.covariance is not None:
+                cov[i, : theta.size, : theta.size] = r.covariance
+            flags[i] = fit_flags(r.model, theta, r.covariance, "fit.global_search" in r.stage_times)
+        ids = np.empty(m, dtype=object)
+        ids[:] = list(well_ids) if well_ids is not None else list(range(m))
+        return cls(
+            well_id=ids,
+            model=np.array([r.model for r in results], dtype=object),
+            objective=np.array([r.objective for r in results], dtype=object),
+            params=params,
+            n_params=np.array([r.n_params for r in results], dtype=np.int8),
+            success=np.array([r.success for r in results], dtype=bool),
+            loss=np.array([r.loss for r in results], dtype=float),
+            aic=np.array([r.aic for r in results], dtype=float),
+            bic=np.array([r.bic for r in results], dtype=float),
+            n_obs=np.array([r.n_obs for r in results], dtype=np.int64),
+            nfev=np.array([r.nfev for r in results], dtype=np.int32),
+            flags=flags,
+            covariance=pack_covariance(cov),
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence[FitTable]) -> FitTable:
+        """Stack tables row-wise, padding params and covariances to the widest k."""
+        k_max = max((t.params.shape[1] for t in tables), default=0)
+        columns: dict[str, list[Array]] = {f.name: [] for f in fields(cls)}
+        for table in tables:
+            m, k = table.params.shape
+            for f in fields(cls):
+                columns[f.name].append(getattr(table, f.name))
+            if k < k_max:
+                params = np.full((m, k_max), np.nan)
+                params[:, :k] = table.params
+                cov = np.full((m, k_max, k_max), np.nan)
+                cov[:, :k, :k] = unpack_covariance(np.asarray(table.covariance), k)
+                columns["params"][-1] = params
+                columns["covariance"][-1] = pack_covariance(cov)
+        if not tables:
+            return cls.from_results([])
+        return cls(**{name: np.concatenate(parts) for name, parts in columns.items()})
+
+    def save(self, directory: str | Path) -> None:
+        """Write one `.npy` per column plus `meta.json`; `load` memory-maps them back."""
+        d = Path(directory)
+        d.mkdir(parents=True, exist_ok=True)
+        meta: dict[str, object] = {"version": _FORMAT_VERSION, "categories": {}}
+        for f in fields(self):
+            values = getattr(self, f.name)
+            if f.name in _CATEGORICAL:
+                names, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+                meta["categories"][f.name] = names.tolist()
+                values = codes.astype(np.uint8)
+            elif f.name == "well_id":
+                values = _id_array(values)
+            np.save(d / f"{f.name}.npy", np.asarray(values))
+        (d / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> FitTable:
+        d = Path(directory)
+        meta = json.loads((d / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported FitTable format version: {meta.get('version')}")
+        columns = {}
+        for f in fields(cls):
+            values = np.load(d / f"{f.name}.npy", mmap_mode="r" if mmap else None)
+            if f.name in _CATEGORICAL:
+                values = np.array(meta["categories"][f.name], dtype=object)[values]
+            columns[f.name] = values
+        return cls(**columns)
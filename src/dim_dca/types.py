@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable
 
 import numpy as np
@@ -21,6 +21,11 @@ class FitResult:
     message: str
     n_obs: int
     n_params: int
+    nfev: int = 0
+    njev: int = 0
+    wall_time: float = 0.0
+    stage_times: dict[str, float] = field(default_factory=dict)
 
 
 ModelCallable = Callable[[Array, dict[str, float]], Array]
+KernelCallable = Callable[[Array, Array], Array]
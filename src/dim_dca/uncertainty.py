@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 import numpy as np
 
-from .fit import FitOptions, fit_model
-from .models import MODEL_SPECS
+from .batch import batched_least_squares
+from .cache import FitCache, content_key
+from .fit import FitOptions, _pack, _unpack, fit_model
+from .instrument import stage
+from .models import MODEL_SPECS, RATE_KERNELS
+from .parallel import run_tasks
 from .types import Array, FitResult
 
 
@@ -11,34 +17,87 @@ def fisher_information(jacobian: Array, sigma2: float = 1.0) -> Array:
     return (jacobian.T @ jacobian) / sigma2
 
 
-def bootstrap_params(
+def _pairs_replicate(model: str, t: Array, q: Array, theta0: Array, idx: Array) -> Array | None:
+    order = MODEL_SPECS[model].param_order
+    res = fit_model(model, t[idx], q[idx], _unpack(theta0, order), FitOptions())
+    return _pack(res.params, order) if res.success else None
+
+
+def bootstrap_samples(
     model: str,
     t: Array,
     q: Array,
     base_params: dict[str, float],
     n_boot: int = 100,
     seed: int = 123,
-) -> list[dict[str, float]]:
+    method: str = "pairs",
+    backend: str = "serial",
+    n_jobs: int | None = None,
+) -> Array:
+    """Bootstrap parameter samples as an (n_success, k) array in `param_order`.
+
+    Every replicate is warm-started from `base_params`. `pairs` resamples (t, q)
+    rows and refits each replicate (optionally on a worker pool); `residual` and
+    `wild` keep the time grid fixed, perturb the base-fit residuals and solve all
+    replicates together with `batched_least_squares`.
+    """
     rng = np.random.default_rng(seed)
-    fits: list[dict[str, float]] = []
+    spec = MODEL_SPECS[model]
+    theta0 = _pack(base_params, spec.param_order)
     n = len(t)
-    for _ in range(n_boot):
-        idx = rng.integers(0, n, size=n)
-        tt, qq = t[idx], q[idx]
-        order = np.argsort(tt)
-        res = fit_model(model, tt[order], qq[order], base_params, FitOptions())
-        if res.success:
-            fits.append(res.params)
-    return fits
-
-
-def param_ci(samples: list[dict[str, float]], alpha: float = 0.05) -> dict[str, tuple[float, float]]:
-    if not samples:
+    if method == "pairs":
+        order = np.argsort(t, kind="stable")
+        ts, qs = t[order], q[order]
+        tasks = [(model, ts, qs, theta0, np.sort(rng.integers(0, n, size=n))) for _ in range(n_boot)]
+        with stage("uncertainty.bootstrap") as st:
+            out = [x for x in run_tasks(_pairs_replicate, tasks, backend=backend, n_jobs=n_jobs) if x is not None]
+            st.counters.update(replicates=n_boot, succeeded=len(out))
+        return np.array(out, dtype=float).reshape(len(out), len(theta0))
+
+    qhat = RATE_KERNELS[model](t, theta0)
+    r = q - qhat
+    if method == "residual":
+        y = qhat + rng.choice(r - np.mean(r), size=(n_boot, n), replace=True)
+    elif method == "wild":
+        y = qhat + r * rng.choice(np.array([-1.0, 1.0]), size=(n_boot, n))
+    else:
+        raise ValueError(f"Unknown bootstrap method: {method}")
+    with stage("uncertainty.bootstrap") as st:
+        theta, ok = batched_least_squares(model, t, y, theta0)
+        st.counters.update(replicates=n_boot, succeeded=int(ok.sum()))
+    return theta[ok]
+
+
+def bootstrap_params(
+    model: str,
+    t: Array,
+    q: Array,
+    base_params: dict[str, float],
+    n_boot: int = 100,
+    seed: int = 123,
+    cache: FitCache | None = None,
+) -> list[dict[str, float]]:
+    if cache is not None:
+        key = content_key("bootstrap_params", model, t, q, base_params, n_boot, seed)
+        return cache.get_or_compute(key, lambda: bootstrap_params(model, t, q, base_params, n_boot, seed))
+    order = MODEL_SPECS[model].param_order
+    samples = bootstrap_samples(model, t, q, base_params, n_boot=n_boot, seed=seed)
+    return [_unpack(row, order) for row in samples]
+
+
+def param_ci(
+    samples: list[dict[str, float]] | Array,
+    alpha: float = 0.05,
+    names: tuple[str, ...] | None = None,
+) -> dict[str, tuple[float, float]]:
+    if len(samples) == 0:
         return {}
-    keys = samples[0].keys()
+    if isinstance(samples, np.ndarray):
+        cols = dict(zip(names or range(samples.shape[1]), samples.T, strict=True))
+    else:
+        cols = {k: np.array([s[k] for s in samples]) for k in samples[0]}
     out: dict[str, tuple[float, float]] = {}
-    for k in keys:
-        vals = np.array([s[k] for s in samples])
+    for k, vals in cols.items():
         out[k] = (float(np.quantile(vals, alpha / 2)), float(np.quantile(vals, 1 - alpha / 2)))
     return out
 
@@ -53,29 +112,158 @@ def random_walk_mcmc(
     step_scale: float = 0.05,
     seed: int = 123,
 ) -> Array:
-    from .models import RATE_FUNCS
-
     rng = np.random.default_rng(seed)
     spec = MODEL_SPECS[model]
     order = spec.param_order
     lb = np.array(spec.bounds[0])
     ub = np.array(spec.bounds[1])
-    fn = RATE_FUNCS[model]
+    fn = RATE_KERNELS[model]
 
     theta = np.array([start[k] for k in order], dtype=float)
 
     def logp(th: Array) -> float:
         if np.any(th <= lb) or np.any(th >= ub):
             return -np.inf
-        pred = fn(t, {k: float(v) for k, v in zip(order, th, strict=True)})
+        pred = fn(t, th)
         return float(-0.5 * np.sum(((q - pred) / sigma) ** 2))
 
     lp = logp(theta)
     chain = np.zeros((n_samples, len(theta)))
-    for i in range(n_samples):
-        prop = theta + rng.normal(0.0, step_scale, size=len(theta))
-        lpp = logp(prop)
-        if np.log(rng.random()) < (lpp - lp):
-            theta, lp = prop, lpp
-        chain[i] = theta
+    with stage("uncertainty.mcmc") as st:
+        accepted = 0
+        for i in range(n_samples):
+            prop = theta + rng.normal(0.0, step_scale, size=len(theta))
+            lpp = logp(prop)
+            if np.log(rng.random()) < (lpp - lp):
+                theta, lp = prop, lpp
+                accepted += 1
+            chain[i] = theta
+        st.counters.update(samples=n_samples, accepted=accepted)
     return chain
+
+
+@dataclass
+class MCMCResult:
+    chains: Array
+    acceptance: Array
+    rhat: Array
+    ess: Array
+
+
+def gelman_rubin(chains: Array) -> Array:
+    """Split R-hat per parameter for chains shaped (n_chains, n_samples, k)."""
+    half = chains.shape[1] // 2
+    x = np.concatenate([chains[:, :half], chains[:, half : 2 * half]], axis=0)
+    n = x.shape[1]
+    w = np.mean(np.var(x, axis=1, ddof=1), axis=0)
+    b = n * np.var(np.mean(x, axis=1), axis=0, ddof=1)
+    var_plus = (n - 1) / n * w + b / n
+    return np.sqrt(var_plus / np.maximum(w, 1e-300))
+
+
+def effective_sample_size(chains: Array) -> Array:
+    """Multi-chain ESS per parameter using Geyer's initial monotone sequence."""
+    m, n, k = chains.shape
+    x = chains - np.mean(chains, axis=1, keepdims=True)
+    f = np.fft.rfft(x, n=2 * n, axis=1)
+    acov = np.fft.irfft(f * np.conj(f), axis=1)[:, :n] / n
+    w = np.mean(acov[:, 0] * n / (n - 1), axis=0)
+    var_plus = w * (n - 1) / n
+    if m > 1:
+        var_plus = var_plus + np.var(np.mean(chains, axis=1), axis=0, ddof=1)
+    rho = 1.0 - (w - np.mean(acov, axis=0)) / np.maximum(var_plus, 1e-300)
+    rho[0] = 1.0
+    ess = np.empty(k)
+    for j in range(k):
+        pairs = rho[: 2 * (n // 2), j].reshape(-1, 2).sum(axis=1)
+        neg = np.flatnonzero(pairs < 0.0)
+        pairs = np.minimum.accumulate(pairs[: neg[0] if neg.size else len(pairs)])
+        tau = max(-1.0 + 2.0 * np.sum(pairs), 1.0 / np.log10(m * n + 1))
+        ess[j] = m * n / tau
+    return ess
+
+
+def _proposal_factor(cov: Array, fallback: Array) -> Array:
+    """L with L @ L.T equal to `cov` after clipping its eigenvalues to be positive.
+
+    Asymptotic fit covariances can be indefinite or singular; a non-finite or
+    non-positive one is replaced by the diagonal `fallback`.
+    """
+    if not np.all(np.isfinite(cov)):
+        cov = fallback
+    w, v = np.linalg.eigh(0.5 * (cov + cov.T))
+    if w[-1] <= 0:
+        w, v = np.linalg.eigh(fallback)
+    return v * np.sqrt(np.maximum(w, 1e-12 * w[-1]))
+
+
+def multi_chain_mcmc(
+    model: str,
+    t: Array,
+    q: Array,
+    start: dict[str, float],
+    sigma: float,
+    n_chains: int = 8,
+    n_samples: int = 2000,
+    n_warmup: int = 1000,
+    cov: Array | None = None,
+    adapt_every: int = 50,
+    seed: int = 123,
+) -> MCMCResult:
+    """Random-walk Metropolis over many chains advanced in lockstep.
+
+    All proposals of one step are scored with a single batched rate-kernel call.
+    The proposal covariance starts from `cov` (e.g. `FitResult.covariance`,
+    with non-positive eigenvalues clipped) and is
+    re-estimated from the pooled warm-up draws every `adapt_every` steps; it is
+    frozen after warm-up, which is discarded.
+    """
+    rng = np.random.default_rng(seed)
+    spec = MODEL_SPECS[model]
+    lb = np.array(spec.bounds[0])
+    ub = np.array(spec.bounds[1])
+    fn = RATE_KERNELS[model]
+    theta0 = _pack(start, spec.param_order)
+    k = len(theta0)
+
+    def logp(th: Array) -> Array:
+        inside = np.all((th > lb) & (th < ub), axis=1)
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            lp = -0.5 * np.sum(((q - fn(t, th)) / sigma) ** 2, axis=1)
+        return np.where(inside & np.isfinite(lp), lp, -np.inf)
+
+    fallback = np.diag((1e-2 * np.abs(theta0) + 1e-8) ** 2)
+    scale = 2.38**2 / k
+    chol = _proposal_factor(scale * (fallback if cov is None else np.asarray(cov, dtype=float)), scale * fallback)
+
+    # start strictly inside the bounds, where logp is finite
+    theta = np.clip(theta0 + rng.standard_normal((n_chains, k)) @ chol.T, np.nextafter(lb, ub), np.nextafter(ub, lb))
+    lp = logp(theta)
+    with stage("uncertainty.mcmc") as st:
+        draws = np.empty((n_chains, n_warmup + n_samples, k))
+        accepted = np.zeros(n_chains)
+        for i in range(n_warmup + n_samples):
+            prop = theta + rng.standard_normal((n_chains, k)) @ chol.T
+            lpp = logp(prop)
+            with np.errstate(invalid="ignore"):
+                accept = np.log(rng.random(n_chains)) < (lpp - lp)
+            theta = np.where(accept[:, None], prop, theta)
+            lp = np.where(accept, lpp, lp)
+            draws[:, i] = theta
+            if i >= n_warmup:
+                accepted += accept
+            elif (i + 1) % adapt_every == 0:
+                emp = np.cov(draws[:, : i + 1].reshape(-1, k), rowvar=False).reshape(k, k)
+                try:
+                    chol = np.linalg.cholesky(scale * (emp + 1e-10 * np.diag(np.diag(emp) + 1e-300)))
+                except np.linalg.LinAlgError:
+                    pass
+        st.counters.update(samples=n_chains * n_samples, accepted=int(accepted.sum()))
+
+    chains = draws[:, n_warmup:]
+    return MCMCResult(
+        chains=chains,
+        acceptance=accepted / max(n_samples, 1),
+        rhat=gelman_rubin(chains),
+        ess=effective_sample_size(chains),
+    )
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import numpy as np
 
-from .fit import FitOptions, fit_model
+from .cache import FitCache, content_key
+from .fit import FitOptions, fit_model, update_fit
+from .instrument import stage
 from .models import RATE_FUNCS
+from .parallel import run_tasks
 from .types import Array
 
 
@@ -20,10 +23,112 @@ def blocked_time_series_splits(n: int, n_splits: int = 4, min_train: float = 0.5
     return splits
 
 
-def cv_rmse(model: str, t: Array, q: Array, initial: dict[str, float], n_splits: int = 4) -> float:
+def rolling_origin_splits(
+    n: int, n_origins: int = 24, horizon: int | None = None, min_train: float = 0.5
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Expanding-window splits: train on [0, origin), test on the next `horizon` points.
+
+    Origins are spread evenly from `min_train * n` to `n - horizon`; `horizon`
+    defaults to the spacing between origins.
+    """
+    start = max(int(n * min_train), 1)
+    if horizon is None:
+        horizon = max((n - start) // max(n_origins, 1), 1)
+    origins = np.unique(np.linspace(start, max(n - horizon, start), n_origins).round().astype(int))
+    return [(np.arange(0, o), np.arange(o, min(o + horizon, n))) for o in origins if o < n]
+
+
+def fold_rmse(model: str, t: Array, q: Array, initial: dict[str, float], tr: Array, te: Array) -> float:
+    fit = fit_model(model, t[tr], q[tr], initial, FitOptions())
+    qp = RATE_FUNCS[model](t[te], fit.params)
+    return float(np.sqrt(np.mean((q[te] - qp) ** 2)))
+
+
+def warm_fold_rmse(
+    model: str,
+    t: Array,
+    q: Array,
+    initial: dict[str, float] | None,
+    splits: list[tuple[Array, Array]],
+    update_nfev: int | None = None,
+) -> list[float]:
+    """Test RMSE per expanding-window split, each fold warm-started from the previous one.
+
+    The first fold is fit from `initial`; every later fold continues from the
+    previous solution with `update_fit`, since its training window only appends
+    points. `update_nfev` caps those updates at a few function evaluations.
+    """
+    options = FitOptions() if update_nfev is None else FitOptions(max_nfev=update_nfev)
     errors = []
-    for tr, te in blocked_time_series_splits(len(t), n_splits=n_splits):
-        fit = fit_model(model, t[tr], q[tr], initial, FitOptions())
+    fit = None
+    for tr, te in splits:
+        if fit is None or len(tr) < fit.n_obs:
+            fit = fit_model(model, t[tr], q[tr], initial, FitOptions())
+        else:
+            fit = update_fit(fit, t[tr], q[tr], options)
         qp = RATE_FUNCS[model](t[te], fit.params)
         errors.append(float(np.sqrt(np.mean((q[te] - qp) ** 2))))
+    return errors
+
+
+def cv_cache_key(
+    model: str,
+    t: Array,
+    q: Array,
+    initial: dict[str, float],
+    n_splits: int,
+    warm_start: bool = False,
+    update_nfev: int | None = None,
+) -> str:
+    extra = (warm_start, update_nfev) if warm_start else ()
+    return content_key("cv_rmse", model, t, q, initial, n_splits, *extra)
+
+
+def cv_rmse(
+    model: str,
+    t: Array,
+    q: Array,
+    initial: dict[str, float],
+    n_splits: int = 4,
+    backend: str = "serial",
+    n_jobs: int | None = None,
+    cache: FitCache | None = None,
+    warm_start: bool = False,
+    update_nfev: int | None = None,
+) -> float:
+    """Mean test RMSE over blocked expanding-window splits.
+
+    With `warm_start`, folds run in sequence and each continues from the
+    previous fold's fit (see `warm_fold_rmse`); `backend` is then unused.
+    """
+    if cache is not None:
+        key = cv_cache_key(model, t, q, initial, n_splits, warm_start, update_nfev)
+        return cache.get_or_compute(
+            key, lambda: cv_rmse(model, t, q, initial, n_splits, backend, n_jobs, None, warm_start, update_nfev)
+        )
+    splits = blocked_time_series_splits(len(t), n_splits=n_splits)
+    with stage("cv.rmse") as st:
+        if warm_start:
+            errors = warm_fold_rmse(model, t, q, initial, splits, update_nfev)
+        else:
+            tasks = [(model, t, q, initial, tr, te) for tr, te in splits]
+            errors = run_tasks(fold_rmse, tasks, backend=backend, n_jobs=n_jobs)
+        st.counters["folds"] = len(splits)
     return float(np.mean(errors))
+
+
+def rolling_origin_rmse(
+    model: str,
+    t: Array,
+    q: Array,
+    initial: dict[str, float] | None = None,
+    n_origins: int = 24,
+    horizon: int | None = None,
+    update_nfev: int | None = None,
+) -> Array:
+    """Per-origin test RMSE over `rolling_origin_splits`, warm-starting each origin."""
+    splits = rolling_origin_splits(len(t), n_origins=n_origins, horizon=horizon)
+    with stage("cv.rolling_origin") as st:
+        errors = warm_fold_rmse(model, t, q, initial, splits, update_nfev)
+        st.counters["folds"] = len(splits)
+    return np.array(errors)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from dim_dca.cache import DiskCache, MemoryCache, content_key
+from dim_dca.compare import compare_models
+from dim_dca.fit import FitOptions, fit_model
+from dim_dca.simulate import simulate
+from dim_dca.validation import cv_rmse
+
+
+def test_content_key_tracks_data_and_options() -> None:
+    t = np.linspace(0, 10, 20)
+    q = 100.0 * np.exp(-0.1 * t)
+    init = {"qi": 90.0, "di": 0.2}
+    base = content_key("fit_model", "arps_exp", t, q, init, FitOptions())
+    assert base == content_key("fit_model", "arps_exp", t.copy(), q.copy(), dict(init), FitOptions())
+    assert base != content_key("fit_model", "arps_exp", t, q * 1.001, init, FitOptions())
+    assert base != content_key("fit_model", "arps_exp", t, q, init, FitOptions(objective="huber"))
+
+
+def test_memory_cache_lru_eviction() -> None:
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+
+
+def test_disk_cache_is_size_bounded(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, max_bytes=3000)
+    for i in range(10):
+        cache.set(f"k{i}", np.zeros(100))
+    assert 0 < len(cache) < 10
+    assert "k9" in cache
+    assert np.array_equal(cache.get("k9"), np.zeros(100))
+
+
+def test_disk_cache_concurrent_writers_and_vanishing_entries(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, max_bytes=10**6)
+    # an entry that disappears between glob and stat, as when another process evicts it
+    (tmp_path / "gone.pkl").symlink_to(tmp_path / "missing")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: cache.set("shared", np.full(1000, i)), range(64)))
+    value = cache.get("shared")
+    assert value.shape == (1000,) and np.all(value == value[0])
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_cached_fit_and_compare_reuse_results(tmp_path: Path) -> None:
+    t = np.linspace(0, 24, 60)
+    q = simulate("arps_exp", t, {"qi": 1000.0, "di": 0.2}, noise="gaussian", sigma=1.0, seed=7)
+    initials = {"arps_exp": {"qi": 900.0, "di": 0.1}, "arps_harm": {"qi": 900.0, "di": 0.1}}
+    for cache in (MemoryCache(), DiskCache(tmp_path)):
+        first = fit_model("arps_exp", t, q, initials["arps_exp"], cache=cache)
+        assert fit_model("arps_exp", t, q, initials["arps_exp"], cache=cache).params == first.params
+        cv = cv_rmse("arps_exp", t, q, initials["arps_exp"], cache=cache)
+        rows = compare_models(list(initials), t, q, initials, cache=cache)
+        fresh = compare_models(list(initials), t, q, initials)
+        assert [(r["model"], r["params"], r["cv_rmse"]) for r in rows] == [
+            (r["model"], r["params"], r["cv_rmse"]) for r in fresh
+        ]
+        assert next(r for r in rows if r["model"] == "arps_exp")["cv_rmse"] == cv
+        assert len(cache) == 4
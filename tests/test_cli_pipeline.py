@@ -13,3 +13,10 @@ def test_cli_pipeline(monkeypatch, tmp_path: Path) -> None:
     assert (tmp_path / "fit.png").exists()
     rows = json.loads((tmp_path / "model_comparison.json").read_text(encoding="utf-8"))
     assert len(rows) >= 3
+
+
+def test_cli_no_plot(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("sys.argv", ["dim-dca", "--out", str(tmp_path), "--no-plot"])
+    main()
+    assert (tmp_path / "model_comparison.json").exists()
+    assert not (tmp_path / "fit.png").exists()
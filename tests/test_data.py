@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from dim_dca.data import save_dataset_csv, save_wells_csv, save_wells_npy, stream_wells
+
+
+def _long_format() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    ids = np.repeat(np.array(["A", "B", "C"]), [7, 3, 5])
+    t = np.concatenate([np.arange(7.0), np.arange(3.0), np.arange(5.0)]) * 0.5
+    q = 1000.0 * np.exp(-0.1 * t) + np.arange(len(t)) / 3.0
+    return ids, t, q
+
+
+def test_dataset_csv_roundtrip(tmp_path: Path) -> None:
+    t = np.linspace(0, 10, 11)
+    q = 1000.0 / (1.0 + 0.1 * t)
+    save_dataset_csv(tmp_path / "d.csv", t, q)
+    data = np.loadtxt(tmp_path / "d.csv", delimiter=",", skiprows=1)
+    assert (tmp_path / "d.csv").read_text(encoding="utf-8").startswith("time,rate\n")
+    assert np.array_equal(data[:, 0], t)
+    assert np.array_equal(data[:, 1], q)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".npy"])
+def test_stream_wells_reassembles_wells_across_chunks(tmp_path: Path, suffix: str) -> None:
+    ids, t, q = _long_format()
+    path = tmp_path / f"field{suffix}"
+    (save_wells_csv if suffix == ".csv" else save_wells_npy)(path, ids, t, q)
+    wells = list(stream_wells(path, chunksize=4))
+    assert [w[0] for w in wells] == ["A", "B", "C"]
+    for wid, tw, qw in wells:
+        assert np.array_equal(tw, t[ids == wid])
+        assert np.array_equal(qw, q[ids == wid])
+
+
+def test_stream_wells_parquet(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    ids, t, q = _long_format()
+    pd.DataFrame({"well_id": ids, "time": t, "rate": q}).to_parquet(tmp_path / "f.parquet")
+    wells = list(stream_wells(tmp_path / "f.parquet", chunksize=4))
+    assert [len(w[1]) for w in wells] == [7, 3, 5]
+
+
+def test_stream_wells_rejects_interleaved_rows(tmp_path: Path) -> None:
+    ids, t, q = _long_format()
+    save_wells_csv(tmp_path / "bad.csv", np.concatenate([ids, ids[:1]]), np.append(t, 9.0), np.append(q, 1.0))
+    with pytest.raises(ValueError, match="not contiguous"):
+        list(stream_wells(tmp_path / "bad.csv"))
+
+
+def test_stream_wells_closes_csv_reader(tmp_path: Path, monkeypatch) -> None:
+    from pandas.io.parsers.readers import TextFileReader
+
+    closed = []
+    real_close = TextFileReader.close
+    monkeypatch.setattr(TextFileReader, "close", lambda self: (closed.append(True), real_close(self)))
+    ids, t, q = _long_format()
+    save_wells_csv(tmp_path / "wells.csv", ids, t, q)
+    wells = stream_wells(tmp_path / "wells.csv", chunksize=4)
+    next(wells)
+    wells.close()
+    assert closed
+
+    closed.clear()
+    save_wells_csv(tmp_path / "bad.csv", np.concatenate([ids, ids[:1]]), np.append(t, 9.0), np.append(q, 1.0))
+    with pytest.raises(ValueError, match="not contiguous"):
+        list(stream_wells(tmp_path / "bad.csv"))
+    assert closed
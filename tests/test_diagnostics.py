@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from dim_dca.diagnostics import curvature_peaks, iter_loglog_curvature, loglog_curvature, residual_diagnostics
+
+
+def _series(n: int = 5000) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    t = np.linspace(0.5, 500.0, n)
+    q = 1000.0 / (1.0 + 0.05 * t) ** 1.5 * (1.0 + 0.01 * rng.standard_normal(n))
+    return t, q
+
+
+def _memmap(path: Path, values: np.ndarray) -> np.ndarray:
+    np.save(path, values)
+    return np.load(path, mmap_mode="r")
+
+
+def test_chunked_residual_diagnostics_match_in_memory(tmp_path: Path) -> None:
+    t, q = _series()
+    pred = 1000.0 / (1.0 + 0.05 * t) ** 1.5
+    r = q - pred
+    expected = {
+        "mse": np.mean(r**2),
+        "rmse": np.sqrt(np.mean(r**2)),
+        "mae": np.mean(np.abs(r)),
+        "mape": np.mean(np.abs(r / q)),
+    }
+    y_true, y_pred = _memmap(tmp_path / "q.npy", q), _memmap(tmp_path / "p.npy", pred)
+    for chunk_size in (64, 999, 10**6):
+        assert residual_diagnostics(y_true, y_pred, chunk_size=chunk_size) == pytest.approx(expected, rel=1e-12)
+
+
+def test_chunked_curvature_is_identical_and_streams(tmp_path: Path) -> None:
+    t, q = _series()
+    full = loglog_curvature(t, q, chunk_size=len(t))
+    tm, qm = _memmap(tmp_path / "t.npy", t), _memmap(tmp_path / "q.npy", q)
+    for chunk_size in (1, 2, 3, 257):
+        assert np.array_equal(loglog_curvature(tm, qm, chunk_size=chunk_size), full)
+    out = np.lib.format.open_memmap(tmp_path / "curv.npy", mode="w+", dtype=float, shape=(len(t),))
+    loglog_curvature(tm, qm, chunk_size=500, out=out)
+    assert np.array_equal(out, full)
+    assert max(len(block) for _, block in iter_loglog_curvature(tm, qm, chunk_size=300)) == 300
+
+
+def test_streaming_curvature_peaks_match_find_peaks() -> None:
+    t, q = _series()
+    curv = np.abs(loglog_curvature(t, q))
+    height = float(np.quantile(curv, 0.8))
+    expected, _ = signal.find_peaks(curv, height=height)
+    assert np.array_equal(curvature_peaks(t, q, height, chunk_size=333), expected)
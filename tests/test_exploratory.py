@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import numpy as np
+import pytest
 
-from dim_dca.exploratory import run_exploratory_suite
+from dim_dca.exploratory import run_exploratory_field, run_exploratory_suite, symbolic_surrogate_exponents
 from dim_dca.simulate import simulate
 
 
@@ -12,3 +13,39 @@ def test_exploratory_suite_runs() -> None:
     res = run_exploratory_suite(t, q, di=0.09, qi=900.0)
     assert len(res) == 3
     assert all(isinstance(r.metric, float) for r in res)
+
+
+def test_field_suite_matches_single_well_suite() -> None:
+    rng = np.random.default_rng(3)
+    wells, di, qi = {}, [], []
+    for i in range(6):
+        t = np.linspace(0.1, 30, 60 + 10 * i)
+        p = {"qi": 600.0 + 80 * i, "di": 0.05 + 0.01 * i, "b": 0.5 + 0.05 * i}
+        wells[f"W{i}"] = (t, simulate("arps_hyp", t, p, noise="gaussian", sigma=2.0, seed=i))
+        di.append(p["di"])
+        qi.append(rng.uniform(500, 1200))
+    table = run_exploratory_field(wells, di=np.array(di), qi=np.array(qi))
+    assert list(table.well_id) == list(wells)
+    for i, (t, q) in enumerate(wells.values()):
+        h1, h2, h3 = run_exploratory_suite(t, q, di=di[i], qi=qi[i])
+        assert table.h1_corr[i] == pytest.approx(h1.metric, rel=1e-9)
+        assert table.h2_peaks[i] == h2.metric
+        assert table.h3_r2[i] == pytest.approx(h3.metric, rel=1e-9)
+        assert [table.h1_passed[i], table.h2_passed[i], table.h3_passed[i]] == [h1.passed, h2.passed, h3.passed]
+
+    ids = np.repeat(np.array(list(wells)), [len(t) for t, _ in wells.values()])
+    t_all = np.concatenate([t for t, _ in wells.values()])
+    q_all = np.concatenate([q for _, q in wells.values()])
+    long = run_exploratory_field((ids, t_all, q_all), di=0.1)
+    assert long.h3_r2 == pytest.approx(table.h3_r2, rel=1e-12)
+
+
+def test_field_h3_is_stable_for_narrow_log_time_ranges() -> None:
+    # late-life daily data: log(t + 1) spans a narrow range, so raw powers are ill-conditioned
+    t = np.arange(20000.0, 24000.0)
+    q = 500.0 * (1 + 0.3e-3 * t) ** (-1 / 0.3) * np.exp(1e-3 * np.sin(t / 50))
+    x = np.log(t + 1)
+    ref, *_ = np.linalg.lstsq(np.vstack([np.ones_like(x), x, x**2]).T, np.log(q), rcond=None)
+    table = run_exploratory_field({"W": (t, q)}, di=1e-3)
+    assert table.h3_coef[0] == pytest.approx(ref, rel=1e-7)
+    assert table.h3_r2[0] == pytest.approx(symbolic_surrogate_exponents(t, q).metric, rel=1e-12)
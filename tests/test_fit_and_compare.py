@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import numpy as np
+import pytest
+from scipy.optimize import OptimizeResult
 
 from dim_dca.compare import compare_models
-from dim_dca.fit import FitOptions, fit_model
+from dim_dca import fit as fit_mod
+from dim_dca.fit import FitOptions, fit_model, update_fit
 from dim_dca.simulate import simulate
 
 
@@ -28,3 +31,90 @@ def test_compare_models_prefers_true_family() -> None:
     }
     rows = compare_models(list(initials.keys()), t, q, initials)
     assert rows[0]["model"] == "arps_exp"
+
+
+def test_compare_models_parallel_matches_serial() -> None:
+    t = np.linspace(0, 24, 80)
+    q = simulate("arps_exp", t, {"qi": 1000.0, "di": 0.2}, noise="gaussian", sigma=1.0, seed=7)
+    initials = {
+        "arps_exp": {"qi": 900.0, "di": 0.1},
+        "arps_hyp": {"qi": 900.0, "di": 0.1, "b": 0.9},
+    }
+    serial = compare_models(list(initials.keys()), t, q, initials)
+    for backend in ("thread", "process"):
+        rows = compare_models(list(initials.keys()), t, q, initials, backend=backend, n_jobs=2)
+        assert [r["model"] for r in rows] == [r["model"] for r in serial]
+        assert [r["cv_rmse"] for r in rows] == [r["cv_rmse"] for r in serial]
+        assert [r["params"] for r in rows] == [r["params"] for r in serial]
+
+
+def test_compare_models_screening_keeps_winner_and_reports_pruning() -> None:
+    t = np.linspace(0, 36, 240)
+    q = simulate("arps_hyp", t, {"qi": 1200.0, "di": 0.08, "b": 0.7}, noise="gaussian", sigma=2.0, seed=5)
+    models = ["arps_exp", "arps_harm", "arps_hyp", "stretched_exp", "duong", "gompertz", "logistic"]
+    full = compare_models(models, t, q)
+    rows = compare_models(models, t, q, screen=2)
+    assert sorted(r["model"] for r in rows) == sorted(models)
+    finalists = [r for r in rows if r["pruned_at"] is None]
+    assert len(finalists) == 2
+    assert rows[0]["model"] == full[0]["model"]
+    assert rows[0]["bic"] == full[0]["bic"] and rows[0]["cv_rmse"] == full[0]["cv_rmse"]
+    stages = [r["pruned_at"] for r in rows[2:]]
+    assert stages == sorted(stages, reverse=True) and set(stages) == {"screen-0", "screen-1"}
+    assert all(np.isnan(r["cv_rmse"]) and r["n_obs"] < len(t) for r in rows[2:])
+    with pytest.raises(ValueError):
+        compare_models(models, t, q, screen=0)
+
+
+def test_screening_ranks_failed_fits_last(monkeypatch) -> None:
+    from dataclasses import replace
+
+    from dim_dca import compare as compare_mod
+
+    def broken_harmonic(model, t, q, initial=None, options=None):
+        fit = fit_model(model, t, q, initial, options)
+        if model == "arps_harm" and options.max_nfev < FitOptions().max_nfev:
+            return replace(fit, success=False, bic=-np.inf)
+        return fit
+
+    monkeypatch.setattr(compare_mod, "fit_model", broken_harmonic)
+    t = np.linspace(0, 36, 120)
+    q = simulate("arps_hyp", t, {"qi": 1200.0, "di": 0.08, "b": 0.7}, noise="gaussian", sigma=2.0, seed=5)
+    rows = compare_models(["arps_exp", "arps_harm", "arps_hyp"], t, q, screen=2)
+    assert {r["model"]: r["pruned_at"] for r in rows}["arps_harm"] == "screen-0"
+
+
+def test_vectorized_global_search_matches_scalar() -> None:
+    t = np.linspace(0, 36, 120)
+    q = simulate("arps_hyp", t, {"qi": 1200.0, "di": 0.08, "b": 0.7}, noise="gaussian", sigma=2.0, seed=3)
+    init = {"qi": 500.0, "di": 1.0, "b": 1.5}
+    fast = fit_model("arps_hyp", t, q, init, FitOptions(global_search=True))
+    slow = fit_model("arps_hyp", t, q, init, FitOptions(global_search=True, vectorized_global=False))
+    assert fast.success and slow.success
+    assert abs(fast.bic - slow.bic) < 1e-6 * abs(slow.bic)
+
+
+def test_update_fit_warm_start_matches_full_refit(monkeypatch) -> None:
+    t = np.arange(0.0, 61.0)
+    q = simulate("arps_hyp", t, {"qi": 1200.0, "di": 0.08, "b": 0.7}, noise="gaussian", sigma=5.0, seed=1)
+    init = {"qi": 1000.0, "di": 0.1, "b": 0.5}
+    prev = fit_model("arps_hyp", t[:58], q[:58], init, FitOptions())
+    full = fit_model("arps_hyp", t, q, init, FitOptions())
+
+    calls = []
+
+    def fake_global_init(*args):
+        calls.append(args)
+        return OptimizeResult(x=np.array(list(prev.params.values())), nfev=0)
+
+    monkeypatch.setattr(fit_mod, "_global_init", fake_global_init)
+    upd = update_fit(prev, t, q, FitOptions(global_search=True))
+    assert not calls
+    assert upd.n_obs == 61
+    for k, v in full.params.items():
+        assert abs(upd.params[k] - v) <= 1e-5 * abs(v)
+
+    jumped = q.copy()
+    jumped[58:] *= 3.0
+    update_fit(prev, t, jumped, FitOptions(global_search=True))
+    assert len(calls) == 1
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import numpy as np
+
+from dim_dca.forecast import forecast, forecast_quantiles, param_matrix
+from dim_dca.models import RATE_FUNCS
+
+
+def test_forecast_matches_analytic_exponential_eur() -> None:
+    rng = np.random.default_rng(0)
+    theta = np.column_stack([rng.uniform(500, 1500, 50), rng.uniform(0.05, 0.3, 50)])
+    horizon = np.arange(0.0, 601.0)
+    res = forecast("arps_exp", theta, horizon, q_limit=5.0, chunk_size=7)
+    t_lim = np.log(theta[:, 0] / 5.0) / theta[:, 1]
+    assert res.rate.shape == (50, horizon.size)
+    assert res.reached.all()
+    assert np.allclose(res.t_limit, t_lim, rtol=1e-9)
+    assert np.allclose(res.eur, (theta[:, 0] - 5.0) / theta[:, 1], rtol=1e-9)
+    assert np.allclose(res.rate[3], RATE_FUNCS["arps_exp"](horizon, {"qi": theta[3, 0], "di": theta[3, 1]}))
+
+
+def test_forecast_flags_sets_above_limit_at_horizon_end() -> None:
+    res = forecast("arps_harm", {"qi": 1000.0, "di": 0.01}, np.linspace(0, 120, 121), q_limit=10.0)
+    assert not res.reached[0]
+    assert res.t_limit[0] == 120.0
+    assert np.isclose(res.eur[0], res.cum[0, -1])
+
+
+def test_forecast_quantiles_are_ordered_and_chunk_invariant() -> None:
+    rng = np.random.default_rng(1)
+    samples = [{"qi": qi, "di": di, "b": 0.8} for qi, di in zip(rng.uniform(500, 1500, 200), rng.uniform(0.05, 0.3, 200))]
+    horizon = np.arange(0.0, 361.0)
+    small = forecast_quantiles("arps_hyp", samples, horizon, q_limit=2.0, chunk_size=16, max_elements=1000)
+    big = forecast_quantiles("arps_hyp", param_matrix("arps_hyp", samples), horizon, q_limit=2.0)
+    assert small["P10"]["eur"] >= small["P50"]["eur"] >= small["P90"]["eur"]
+    assert np.all(small["P10"]["cum"] >= small["P90"]["cum"])
+    for name in ("P10", "P50", "P90"):
+        assert np.allclose(small[name]["rate"], big[name]["rate"])
+        assert np.isclose(small[name]["eur"], big[name]["eur"])
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import dim_dca
+import dim_dca.cli
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in ("scipy", "matplotlib", "pandas") if m in sys.modules)
+print(json.dumps({"seconds": elapsed, "heavy": heavy}))
+"""
+
+
+def test_import_is_lazy_and_timed(record_property) -> None:
+    out = subprocess.run([sys.executable, "-c", _PROBE], check=True, capture_output=True, text=True)
+    probe = json.loads(out.stdout)
+    record_property("import_dim_dca_seconds", probe["seconds"])
+    assert probe["heavy"] == []
+
+
+def test_public_names_resolve_lazily() -> None:
+    import dim_dca
+
+    assert dim_dca.fit_model.__module__ == "dim_dca.fit"
+    assert set(dim_dca.__all__) <= set(dir(dim_dca))
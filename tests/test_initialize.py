@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dim_dca.batch import fit_many
+from dim_dca.compare import compare_models
+from dim_dca.fit import FitOptions, fit_model
+from dim_dca.initialize import initial_guess
+from dim_dca.models import MODEL_SPECS, RATE_FUNCS
+from dim_dca.simulate import simulate
+
+TRUE = {
+    "arps_exp": {"qi": 1000.0, "di": 0.1},
+    "arps_harm": {"qi": 1000.0, "di": 0.1},
+    "arps_hyp": {"qi": 1000.0, "di": 0.1, "b": 0.7},
+    "stretched_exp": {"qi": 1000.0, "tau": 10.0, "n": 0.8},
+    "duong": {"q1": 1000.0, "a": -0.2, "m": 0.5},
+    "gompertz": {"qmax": 20000.0, "alpha": 3.0, "beta": 0.1},
+    "logistic": {"qmax": 20000.0, "k": 0.1, "t0": 10.0},
+}
+
+
+@pytest.mark.parametrize("model", list(TRUE))
+def test_guess_converges_without_global_search(model: str) -> None:
+    t = np.linspace(0, 60, 120)
+    clean = RATE_FUNCS[model](t, TRUE[model])
+    q = simulate(model, t, TRUE[model], noise="gaussian", sigma=0.02 * clean.max(), seed=1)
+    guess = initial_guess(model, t, q)
+    rmse = np.sqrt(np.mean((RATE_FUNCS[model](t, guess) - clean) ** 2))
+    assert rmse < 0.1 * clean.max()
+
+    local = fit_model(model, t, q)
+    best = fit_model(model, t, q, guess, FitOptions(global_search=True))
+    assert local.success
+    assert local.loss <= best.loss * 1.001 + 1e-9
+
+
+@pytest.mark.parametrize("model", list(TRUE))
+def test_guess_is_inside_bounds_for_degenerate_data(model: str) -> None:
+    lb, ub = MODEL_SPECS[model].bounds
+    for t, q in [(np.arange(2.0), np.array([5.0, 4.0])), (np.arange(10.0), np.zeros(10)), (np.ones(5), np.ones(5))]:
+        theta = list(initial_guess(model, t, q).values())
+        assert np.all(np.isfinite(theta))
+        assert np.all(np.array(lb) <= theta) and np.all(theta <= np.array(ub))
+
+
+def test_initials_are_optional_in_batch_apis() -> None:
+    t = np.linspace(0, 24, 60)
+    q = simulate("arps_exp", t, {"qi": 1000.0, "di": 0.2}, noise="gaussian", sigma=1.0, seed=7)
+    rows = compare_models(["arps_exp", "arps_harm", "arps_hyp"], t, q)
+    assert rows[0]["model"] in {"arps_exp", "arps_hyp"}
+
+    wells = {"a": (t, q), "b": (t, 0.5 * q)}
+    table = fit_many("arps_exp", wells)
+    assert table.success.all()
+    assert table.param_dict(1)["qi"] == pytest.approx(500.0, rel=0.05)
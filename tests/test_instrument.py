@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from dim_dca.cli import main
+from dim_dca.fit import FitOptions, fit_model
+from dim_dca.instrument import add_hook, profile, remove_hook, stage
+from dim_dca.simulate import simulate
+
+
+def _data() -> tuple[np.ndarray, np.ndarray]:
+    t = np.linspace(0, 36, 80)
+    return t, simulate("arps_hyp", t, {"qi": 1000.0, "di": 0.1, "b": 0.7}, noise="gaussian", sigma=2.0, seed=3)
+
+
+def test_fit_result_reports_evaluations_and_timing() -> None:
+    t, q = _data()
+    res = fit_model("arps_hyp", t, q, {"qi": 900.0, "di": 0.2, "b": 0.5}, FitOptions(global_search=True))
+    assert res.nfev > 0 and res.njev > 0
+    assert res.wall_time > 0.0
+    assert set(res.stage_times) == {"fit.global_search", "fit.least_squares"}
+
+
+def test_profile_aggregates_stages_and_calls_hooks() -> None:
+    t, q = _data()
+    seen: list[str] = []
+
+    def hook(name: str, seconds: float, counters: dict[str, int]) -> None:
+        seen.append(name)
+
+    add_hook(hook)
+    try:
+        with profile() as rec:
+            for _ in range(2):
+                fit_model("arps_hyp", t, q, {"qi": 900.0, "di": 0.2, "b": 0.5})
+            with stage("custom") as st:
+                st.counters["items"] = 5
+    finally:
+        remove_hook(hook)
+
+    summary = rec.summary()
+    assert summary["fit.least_squares"]["calls"] == 2
+    assert summary["fit.least_squares"]["nfev"] > 0
+    assert summary["custom"]["items"] == 5
+    assert seen.count("fit.least_squares") == 2
+
+    with stage("outside"):
+        pass
+    assert "outside" not in rec.stages
+
+
+def test_cli_profile_writes_summary(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("sys.argv", ["dim-dca", "--out", str(tmp_path), "--profile"])
+    main()
+    summary = json.loads((tmp_path / "profile.json").read_text(encoding="utf-8"))
+    assert {"compare.grid", "fit.least_squares"} <= set(summary)
+
+
+def test_failing_hook_does_not_change_stage_outcome() -> None:
+    def broken(name: str, seconds: float, counters: dict[str, int]) -> None:
+        raise KeyError("exporter down")
+
+    t, q = _data()
+    add_hook(broken)
+    try:
+        with pytest.warns(RuntimeWarning, match="exporter down"):
+            fit = fit_model("arps_hyp", t, q, {"qi": 900.0, "di": 0.2, "b": 0.5})
+        assert fit.success
+        with pytest.warns(RuntimeWarning), pytest.raises(ValueError, match="body"):
+            with stage("failing"):
+                raise ValueError("body")
+    finally:
+        remove_hook(broken)
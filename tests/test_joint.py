@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dim_dca.batch import fit_many
+from dim_dca.joint import fit_joint
+from dim_dca.simulate import simulate
+
+
+def _field(n_wells: int = 25, b: float = 0.8) -> tuple[dict, np.ndarray]:
+    rng = np.random.default_rng(1)
+    wells, true = {}, []
+    for i in range(n_wells):
+        t = np.linspace(0, 36, int(rng.integers(20, 40)))
+        p = {"qi": rng.uniform(400, 1500), "di": rng.uniform(0.05, 0.3), "b": b}
+        wells[f"W{i:02d}"] = (t, simulate("arps_hyp", t, p, noise="gaussian", sigma=5.0, seed=i))
+        true.append([p["qi"], p["di"], b])
+    return wells, np.array(true)
+
+
+def test_shared_b_is_recovered_across_wells() -> None:
+    wells, true = _field()
+    res = fit_joint("arps_hyp", wells, shared=("b",))
+    assert res.success
+    assert res.shared["b"] == pytest.approx(0.8, abs=0.05)
+    assert res.params.shape == (25, 3)
+    assert np.all(res.params[:, 2] == res.shared["b"])
+    assert np.allclose(res.params[:, 0], true[:, 0], rtol=0.05)
+    assert res.n_params == 1 + 2 * 25
+
+
+def test_no_shared_parameters_matches_independent_fits() -> None:
+    wells, _ = _field(8)
+    joint = fit_joint("arps_exp", wells)
+    table = fit_many("arps_exp", wells)
+    assert list(joint.well_id) == list(table.well_id)
+    assert np.allclose(joint.params, table.params, rtol=1e-4)
+
+
+def test_unknown_shared_parameter_raises() -> None:
+    wells, _ = _field(2)
+    with pytest.raises(ValueError):
+        fit_joint("arps_exp", wells, shared=("b",))
@@ -3,6 +3,12 @@ from __future__ import annotations
 import numpy as np
 
 from dim_dca.models import (
+    CUM_FUNCS,
+    CUM_KERNELS,
+    JAC_FUNCS,
+    MODEL_SPECS,
+    RATE_FUNCS,
+    RATE_KERNELS,
     arps_exponential_rate,
     arps_harmonic_rate,
     arps_hyperbolic_rate,
@@ -46,3 +52,71 @@ def test_dimensionless_invariance_scaling() -> None:
 
     assert np.allclose(tau, tau2)
     assert np.allclose(qd, qd2)
+
+
+PARAMS = {
+    "arps_exp": {"qi": 900.0, "di": 0.1},
+    "arps_harm": {"qi": 900.0, "di": 0.1},
+    "arps_hyp": {"qi": 900.0, "di": 0.1, "b": 0.7},
+    "stretched_exp": {"qi": 900.0, "tau": 10.0, "n": 0.8},
+    "duong": {"q1": 900.0, "a": -0.2, "m": 0.5},
+    "gompertz": {"qmax": 5000.0, "alpha": 3.0, "beta": 0.1},
+    "logistic": {"qmax": 5000.0, "k": 0.1, "t0": 10.0},
+}
+
+
+def test_analytic_jacobians_match_finite_differences() -> None:
+    t = np.linspace(0, 36, 50)
+    for model, p in PARAMS.items():
+        jac = JAC_FUNCS[model](t, p)
+        assert jac.shape == (len(t), len(MODEL_SPECS[model].param_order))
+        for j, name in enumerate(MODEL_SPECS[model].param_order):
+            h = 1e-6 * abs(p[name])
+            hi = RATE_FUNCS[model](t, {**p, name: p[name] + h})
+            lo = RATE_FUNCS[model](t, {**p, name: p[name] - h})
+            assert np.allclose(jac[:, j], (hi - lo) / (2 * h), rtol=1e-5, atol=1e-6 * np.max(np.abs(hi)))
+
+
+def test_theta_kernels_match_dict_api_and_broadcast() -> None:
+    t = np.linspace(0, 36, 50)
+    for model, p in PARAMS.items():
+        theta = np.array([p[k] for k in MODEL_SPECS[model].param_order])
+        batch = np.vstack([theta, theta * 1.05, theta * 0.95])
+        for kernels, funcs in ((RATE_KERNELS, RATE_FUNCS), (CUM_KERNELS, CUM_FUNCS)):
+            single = kernels[model](t, theta)
+            assert np.allclose(single, funcs[model](t, p))
+            rows = kernels[model](t, batch)
+            assert rows.shape == (3, len(t))
+            assert np.allclose(rows[0], single)
+
+
+def test_dict_api_keeps_scalar_shapes() -> None:
+    for model, p in PARAMS.items():
+        k = len(MODEL_SPECS[model].param_order)
+        assert np.shape(RATE_FUNCS[model](5.0, p)) == ()
+        assert np.shape(CUM_FUNCS[model](5.0, p)) == ()
+        assert np.shape(JAC_FUNCS[model](5.0, p)) == (k,)
+        assert RATE_FUNCS[model](5.0, p) == RATE_FUNCS[model](np.array([5.0]), p)[0]
+
+
+def test_closed_form_cumulatives_match_quadrature() -> None:
+    from scipy.integrate import quad
+
+    t = np.array([0.0, 0.5, 3.0, 36.0, 500.0])
+    for model in ("stretched_exp", "duong"):
+        p = PARAMS[model]
+        ref = [quad(lambda s: RATE_FUNCS[model](np.array([s]), p)[0], 0.0, x, limit=500)[0] for x in t]
+        assert np.allclose(CUM_FUNCS[model](t, p), ref, rtol=1e-8, atol=1e-9)
+    zero_a = {"q1": 900.0, "a": 0.0, "m": 0.5}
+    assert np.allclose(CUM_FUNCS["duong"](t, zero_a), 900.0 / 0.5 * (np.sqrt(t + 1.0) - 1.0))
+
+
+def test_gompertz_rate_is_pointwise_derivative_of_cumulative() -> None:
+    p = PARAMS["gompertz"]
+    t = np.array([0.0, 0.3, 2.0, 2.1, 17.0, 60.0])
+    h = 1e-5
+    fd = (CUM_FUNCS["gompertz"](t + h, p) - CUM_FUNCS["gompertz"](t - h, p)) / (2 * h)
+    assert np.allclose(RATE_FUNCS["gompertz"](t, p), fd, rtol=1e-6)
+    single = RATE_FUNCS["gompertz"](np.array([5.0]), p)
+    assert single.shape == (1,)
+    assert single[0] == RATE_FUNCS["gompertz"](np.array([0.0, 5.0]), p)[1]
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from dim_dca.cli import main
+from dim_dca.data import save_wells_csv
+from dim_dca.parallel import imap_tasks
+from dim_dca.runner import WellJob, completed_wells, run_field
+
+
+def _field(path: Path, n_wells: int = 4) -> Path:
+    t = np.linspace(0.0, 36.0, 40)
+    rng = np.random.default_rng(0)
+    ids, ts, qs = [], [], []
+    for i in range(n_wells):
+        qi, di = 800.0 + 100.0 * i, 0.05 + 0.02 * i
+        ids.append(np.full(t.size, f"W{i}"))
+        ts.append(t)
+        qs.append(qi / (1.0 + 0.6 * di * t) ** (1.0 / 0.6) + rng.normal(0.0, 2.0, t.size))
+    save_wells_csv(path, np.concatenate(ids), np.concatenate(ts), np.concatenate(qs))
+    return path
+
+
+def _records(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_imap_tasks_streams_every_result() -> None:
+    tasks = ((i,) for i in range(20))
+    assert sorted(imap_tasks(lambda x: x * x, tasks, backend="thread", n_jobs=3, max_pending=4)) == [i * i for i in range(20)]
+
+
+def test_fit_command_resumes_after_interruption(tmp_path: Path, capsys) -> None:
+    src = _field(tmp_path / "field.csv")
+    out = tmp_path / "fits.jsonl"
+    main(["fit", str(src), "-o", str(out), "--chunksize", "25"])
+    full = _records(out)
+    assert [r["well_id"] for r in full] == ["W0", "W1", "W2", "W3"]
+    assert all(r["success"] and set(r["params"]) == {"qi", "di", "b"} for r in full)
+
+    # keep two wells plus a torn line, as if the run had been killed mid-write
+    lines = out.read_text(encoding="utf-8").splitlines(keepends=True)
+    out.write_text("".join(lines[:2]) + lines[2][:15], encoding="utf-8")
+    assert completed_wells(out) == {"W0", "W1"}
+    main(["fit", str(src), "-o", str(out)])
+    assert "2 well(s)" in capsys.readouterr().out
+    resumed = _records(out)
+    assert sorted(r["well_id"] for r in resumed) == ["W0", "W1", "W2", "W3"]
+    assert resumed[3]["params"] == pytest.approx(full[3]["params"])
+
+
+def test_resume_retries_wells_recorded_with_an_error(tmp_path: Path) -> None:
+    src = _field(tmp_path / "field.csv", n_wells=2)
+    out = tmp_path / "fits.jsonl"
+    out.write_text(
+        json.dumps({"well_id": "W0", "n_obs": 40, "error": "MemoryError: "}) + "\n"
+        + json.dumps({"well_id": "W1", "n_obs": 40, "success": True}) + "\n",
+        encoding="utf-8",
+    )
+    assert completed_wells(out) == {"W1"}
+    assert run_field("fit", src, out) == 1
+    recs = _records(out)
+    assert [r["well_id"] for r in recs] == ["W0", "W1", "W0"]
+    assert recs[-1]["success"] and "error" not in recs[-1]
+
+
+def test_forecast_and_compare_commands_with_workers(tmp_path: Path) -> None:
+    src = _field(tmp_path / "field.csv", n_wells=3)
+    out = tmp_path / "forecast.jsonl"
+    main(["forecast", str(src), "-o", str(out), "--jobs", "2", "--q-limit", "5"])
+    recs = _records(out)
+    assert sorted(r["well_id"] for r in recs) == ["W0", "W1", "W2"]
+    assert all(r["eur"] > 0 and r["t_limit"] > 36.0 for r in recs)
+
+    assert run_field("compare", src, tmp_path / "cmp.jsonl", WellJob(models=("arps_exp", "arps_hyp"))) == 3
+    best = {r["best"] for r in _records(tmp_path / "cmp.jsonl")}
+    assert best <= {"arps_exp", "arps_hyp"}
+
+
+def test_uncertainty_command_reports_eur_quantiles(tmp_path: Path) -> None:
+    src = _field(tmp_path / "field.csv", n_wells=2)
+    out = tmp_path / "unc.jsonl"
+    main(["uncertainty", str(src), "-o", str(out), "--n-boot", "30"])
+    for rec in _records(out):
+        assert rec["eur"]["P90"] <= rec["eur"]["P50"] <= rec["eur"]["P10"]
+        lo, hi = rec["ci"]["qi"]
+        assert lo <= rec["params"]["qi"] <= hi
+
+
+def test_parquet_output_resumes(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    src = _field(tmp_path / "field.csv")
+    out = tmp_path / "fits.parquet"
+    assert run_field("fit", src, out) == 4
+    assert run_field("fit", src, out) == 0
+    table = pq.read_table(next(out.glob("part-*.parquet")))
+    assert sorted(table.column("well_id").to_pylist()) == ["W0", "W1", "W2", "W3"]
+
+
+def test_parquet_parts_keep_a_fixed_schema_after_errors(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    from dim_dca.runner import ParquetSink
+
+    fit = {"model": "arps_exp", "success": True, "loss": 1.0, "aic": 2.0, "bic": 3.0, "nfev": 7}
+    out = tmp_path / "fits.parquet"
+    sink = ParquetSink(out, "fit", batch_size=2)
+    sink.write({"well_id": "W0", "n_obs": 0, "error": "ValueError: empty"})
+    sink.write({"well_id": "W1", "n_obs": 40, "params": {"qi": 1.0, "di": 0.1}, **fit})
+    sink.write({"well_id": "W2", "n_obs": 40, "params": {"qi": 2.0, "di": 0.1}, **fit})
+    sink.close()
+    parts = [pq.read_table(p) for p in sorted(out.glob("part-*.parquet"))]
+    assert len(parts) == 2 and parts[0].schema == parts[1].schema
+    rows = parts[0].to_pylist()
+    assert rows[0]["error"] and rows[0]["bic"] is None
+    assert rows[1]["bic"] == 3.0 and json.loads(rows[1]["params"])["qi"] == 1.0
+
+
+def test_compare_screen_rejects_zero_and_reports_pruned_rows(tmp_path: Path) -> None:
+    src = _field(tmp_path / "field.csv", n_wells=1)
+    with pytest.raises(SystemExit):
+        main(["compare", str(src), "-o", str(tmp_path / "bad.jsonl"), "--screen", "0"])
+    out = tmp_path / "cmp.jsonl"
+    job = WellJob(models=("arps_exp", "arps_harm", "arps_hyp"), screen=1)
+    assert run_field("compare", src, out, job) == 1
+    ranking = _records(out)[0]["ranking"]
+    assert ranking[0]["pruned_at"] is None
+    assert all(r["pruned_at"].startswith("screen-") for r in ranking[1:])
+
+
+def test_profile_applies_to_field_runs_and_no_plot_is_rejected(tmp_path: Path) -> None:
+    src = _field(tmp_path / "field.csv", n_wells=2)
+    out = tmp_path / "run" / "fits.jsonl"
+    main(["--profile", "fit", str(src), "-o", str(out)])
+    summary = json.loads((out.parent / "profile.json").read_text(encoding="utf-8"))
+    assert summary["fit.least_squares"]["calls"] >= 2
+    with pytest.raises(SystemExit):
+        main(["--no-plot", "fit", str(src), "-o", str(out)])
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from dim_dca.compare import compare_models
+from dim_dca.fit import fit_model
+from dim_dca.service import FitService
+from dim_dca.simulate import simulate
+
+T = np.linspace(0, 36, 120)
+QS = [simulate("arps_hyp", T, {"qi": 1000.0 + 20.0 * i, "di": 0.1, "b": 0.6}, seed=i) for i in range(6)]
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_concurrent_fits_are_coalesced_and_match_fit_model(backend: str) -> None:
+    async def run() -> tuple[list, int]:
+        async with FitService(backend, n_jobs=2, max_batch=4, batch_window=0.05) as service:
+            fits = await asyncio.gather(*(service.fit_async("arps_hyp", T, q) for q in QS))
+            return fits, service.batches
+
+    fits, batches = asyncio.run(run())
+    assert batches == 2
+    for fit, q in zip(fits, QS, strict=True):
+        ref = fit_model("arps_hyp", T, q)
+        assert fit.model == "arps_hyp" and fit.success
+        assert fit.params == pytest.approx(ref.params, rel=1e-6)
+
+
+def test_backpressure_and_mixed_initials() -> None:
+    async def run() -> tuple[list, int]:
+        async with FitService("thread", max_pending=1, batch_window=0.01) as service:
+            fits = await asyncio.gather(
+                service.fit_async("arps_hyp", T, QS[0], {"qi": 900.0, "di": 0.2, "b": 0.5}),
+                service.fit_async("arps_hyp", T, QS[1]),
+            )
+            return fits, service.batches
+
+    fits, batches = asyncio.run(run())
+    assert batches == 2
+    assert all(f.success for f in fits)
+
+
+def test_compare_async_and_timeout() -> None:
+    async def run() -> list[dict]:
+        async with FitService("thread", batch_window=1.0) as service:
+            with pytest.raises(asyncio.TimeoutError):
+                await service.fit_async("arps_exp", T, QS[0], timeout=0.01)
+            with pytest.raises(ValueError):
+                await service.fit_async("nope", T, QS[0])
+            rows = await service.compare_async(["arps_exp", "arps_hyp"], T, QS[0], timeout=60)
+            assert service.batches == 0
+            return rows
+
+    rows = asyncio.run(run())
+    assert [r["model"] for r in rows] == [r["model"] for r in compare_models(["arps_exp", "arps_hyp"], T, QS[0])]
+
+
+def test_bad_request_fails_only_itself() -> None:
+    async def run() -> list:
+        async with FitService("thread", batch_window=0.05) as service:
+            bad_q = QS[1].copy()
+            bad_q[3] = np.nan
+            return await asyncio.gather(
+                service.fit_async("arps_hyp", T, QS[0]),
+                service.fit_async("arps_hyp", T, bad_q),
+                service.fit_async("arps_hyp", T[:-1], QS[2]),
+                return_exceptions=True,
+            )
+
+    good, nan, mismatch = asyncio.run(run())
+    assert good.success
+    assert isinstance(nan, ValueError) and isinstance(mismatch, ValueError)
+
+
+def test_worker_error_is_isolated_to_its_row(monkeypatch) -> None:
+    from dim_dca import service as service_mod
+
+    real = service_mod.fit_many
+
+    def flaky(model, wells, initial=None, options=None):
+        if any(q[0] < 0 for _, _, q in wells):
+            raise RuntimeError("bad well")
+        return real(model, wells, initial, options)
+
+    monkeypatch.setattr(service_mod, "fit_many", flaky)
+
+    async def run() -> list:
+        async with FitService("thread", batch_window=0.05) as service:
+            return await asyncio.gather(
+                service.fit_async("arps_hyp", T, QS[0]),
+                service.fit_async("arps_hyp", T, -QS[1]),
+                return_exceptions=True,
+            )
+
+    good, bad = asyncio.run(run())
+    assert good.success and good.params == pytest.approx(fit_model("arps_hyp", T, QS[0]).params, rel=1e-6)
+    assert isinstance(bad, RuntimeError)
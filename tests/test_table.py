@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from dim_dca.batch import fit_many
+from dim_dca.fit import FitOptions, fit_model
+from dim_dca.simulate import simulate
+from dim_dca.table import FLAG_COVARIANCE, FLAG_GLOBAL_SEARCH, FitTable, pack_covariance, unpack_covariance
+
+
+def _wells(n: int = 3) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    t = np.linspace(0, 36, 60)
+    return {
+        f"W{i}": (t, simulate("arps_hyp", t, {"qi": 900.0 + 50 * i, "di": 0.1, "b": 0.6}, sigma=2.0, seed=i))
+        for i in range(n)
+    }
+
+
+def test_covariance_packing_roundtrip() -> None:
+    a = np.random.default_rng(0).normal(size=(5, 3, 3))
+    cov = a @ a.transpose(0, 2, 1)
+    assert pack_covariance(cov).shape == (5, 6)
+    assert np.allclose(unpack_covariance(pack_covariance(cov), 3), cov)
+
+
+def test_row_view_matches_fit_model() -> None:
+    wells = _wells()
+    table = fit_many("arps_hyp", wells)
+    assert not hasattr(table, "__dict__")
+    assert table.covariance.shape == (3, 6)
+    for i, (t, q) in enumerate(wells.values()):
+        row, single = table.row(i), fit_model("arps_hyp", t, q)
+        assert row.params == pytest.approx(single.params)
+        assert row.bic == pytest.approx(single.bic)
+        assert np.allclose(row.covariance, single.covariance, rtol=1e-6)
+        assert table.flags[i] & FLAG_COVARIANCE
+
+
+def test_from_results_concat_and_mmap_roundtrip(tmp_path: Path) -> None:
+    t, q = _wells(1)["W0"]
+    results = [fit_model("arps_exp", t, q), fit_model("duong", t, q, options=FitOptions(global_search=True))]
+    mixed = FitTable.from_results(results, well_ids=["A", "A"])
+    assert mixed.params.shape == (2, 3) and np.isnan(mixed.params[0, 2])
+    assert mixed.flags[1] & FLAG_GLOBAL_SEARCH and not mixed.flags[0] & FLAG_GLOBAL_SEARCH
+    assert mixed.covariance_matrix(0).shape == (2, 2)
+
+    narrow = fit_many("arps_exp", {"B": (t, q)})
+    table = FitTable.concat([narrow, mixed])
+    assert list(table.model) == ["arps_exp", "arps_exp", "duong"]
+    assert np.allclose(table.covariance_matrix(0), narrow.covariance_matrix(0))
+
+    table.save(tmp_path / "fits")
+    loaded = FitTable.load(tmp_path / "fits")
+    assert isinstance(loaded.params, np.memmap)
+    assert list(loaded.well_id) == ["B", "A", "A"]
+    assert list(loaded.model) == ["arps_exp", "arps_exp", "duong"]
+    for i in range(len(table)):
+        a, b = loaded.row(i), table.row(i)
+        assert a.params == b.params and a.bic == b.bic and a.success == b.success
+    assert loaded.take(loaded.model == "duong").row(0).params == results[1].params
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import warnings
+
 import numpy as np
 
-from dim_dca.fit import FitOptions, fit_model
+from dim_dca.fit import FitOptions, fit_bayesian_map, fit_model
 from dim_dca.simulate import simulate
-from dim_dca.uncertainty import bootstrap_params, param_ci, random_walk_mcmc
+from dim_dca.uncertainty import (
+    bootstrap_params,
+    bootstrap_samples,
+    effective_sample_size,
+    gelman_rubin,
+    multi_chain_mcmc,
+    param_ci,
+    random_walk_mcmc,
+)
 
 
 def test_bootstrap_ci_contains_true_qi() -> None:
@@ -17,6 +27,27 @@ def test_bootstrap_ci_contains_true_qi() -> None:
     assert ci["qi"][0] <= true["qi"] <= ci["qi"][1]
 
 
+def test_fixed_grid_bootstrap_returns_sample_matrix() -> None:
+    t = np.linspace(0, 20, 100)
+    true = {"qi": 800.0, "di": 0.15}
+    q = simulate("arps_exp", t, true, noise="gaussian", sigma=3.0, seed=2)
+    fit = fit_model("arps_exp", t, q, {"qi": 700.0, "di": 0.1}, FitOptions())
+    for method in ("residual", "wild"):
+        samples = bootstrap_samples("arps_exp", t, q, fit.params, n_boot=200, seed=1, method=method)
+        assert samples.shape == (200, 2)
+        ci = param_ci(samples, names=("qi", "di"))
+        assert ci["qi"][0] <= true["qi"] <= ci["qi"][1]
+
+
+def test_pairs_bootstrap_parallel_matches_serial() -> None:
+    t = np.linspace(0, 20, 60)
+    q = simulate("arps_exp", t, {"qi": 800.0, "di": 0.15}, noise="gaussian", sigma=3.0, seed=2)
+    base = {"qi": 800.0, "di": 0.15}
+    serial = bootstrap_samples("arps_exp", t, q, base, n_boot=8, seed=4)
+    threaded = bootstrap_samples("arps_exp", t, q, base, n_boot=8, seed=4, backend="thread", n_jobs=2)
+    assert np.array_equal(serial, threaded)
+
+
 def test_mcmc_shape_and_finiteness() -> None:
     t = np.linspace(0, 8, 40)
     q = simulate("arps_exp", t, {"qi": 500.0, "di": 0.2}, seed=12)
@@ -25,3 +56,47 @@ def test_mcmc_shape_and_finiteness() -> None:
     )
     assert chain.shape == (300, 2)
     assert np.isfinite(chain).all()
+
+
+def test_bayesian_map_reports_covariance() -> None:
+    t = np.linspace(0, 20, 100)
+    q = simulate("arps_exp", t, {"qi": 800.0, "di": 0.15}, noise="gaussian", sigma=3.0, seed=2)
+    ls = fit_model("arps_exp", t, q, {"qi": 700.0, "di": 0.1}, FitOptions())
+    fit = fit_bayesian_map("arps_exp", t, q, {"qi": 700.0, "di": 0.1}, sigma=3.0)
+    assert fit.covariance is not None
+    assert np.all(np.diag(fit.covariance) > 0)
+    assert abs(fit.params["qi"] - ls.params["qi"]) / ls.params["qi"] < 1e-3
+
+
+def test_multi_chain_mcmc_converges_from_fit_covariance() -> None:
+    t = np.linspace(0, 20, 100)
+    q = simulate("arps_exp", t, {"qi": 800.0, "di": 0.15}, noise="gaussian", sigma=3.0, seed=2)
+    fit = fit_model("arps_exp", t, q, {"qi": 700.0, "di": 0.1}, FitOptions())
+    res = multi_chain_mcmc("arps_exp", t, q, fit.params, sigma=3.0, cov=fit.covariance, n_chains=4, n_samples=1000)
+    assert res.chains.shape == (4, 1000, 2)
+    assert np.all(res.rhat < 1.05)
+    assert np.all(res.ess > 200)
+    assert np.all((res.acceptance > 0.1) & (res.acceptance < 0.8))
+
+
+def test_multi_chain_mcmc_accepts_indefinite_or_missing_covariance() -> None:
+    t = np.linspace(0, 20, 100)
+    q = simulate("arps_exp", t, {"qi": 800.0, "di": 0.15}, noise="gaussian", sigma=3.0, seed=2)
+    fit = fit_model("arps_exp", t, q, {"qi": 700.0, "di": 0.1}, FitOptions())
+    indefinite = fit.covariance.copy()
+    indefinite[0, 1] = indefinite[1, 0] = 2.0 * np.sqrt(indefinite[0, 0] * indefinite[1, 1])
+    assert np.linalg.eigvalsh(indefinite)[0] < 0
+    on_bound = {**fit.params, "di": 1e-8}  # half the initial draws would be clipped onto the bound
+    for start, cov in ((fit.params, indefinite), (fit.params, np.full((2, 2), np.nan)), (on_bound, None)):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            res = multi_chain_mcmc("arps_exp", t, q, start, sigma=3.0, cov=cov, n_chains=4, n_samples=200, n_warmup=200)
+        assert np.all(np.isfinite(res.chains))
+        assert np.all(res.acceptance > 0)
+        assert np.all(np.ptp(res.chains, axis=1).max(axis=1) > 0)
+
+
+def test_chain_diagnostics_on_independent_draws() -> None:
+    draws = np.random.default_rng(0).normal(size=(4, 2000, 2))
+    assert np.allclose(gelman_rubin(draws), 1.0, atol=0.01)
+    assert np.all(effective_sample_size(draws) > 4000)
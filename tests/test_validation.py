@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dim_dca.instrument import profile
+from dim_dca.simulate import simulate
+from dim_dca.validation import (
+    cv_rmse,
+    fold_rmse,
+    rolling_origin_rmse,
+    rolling_origin_splits,
+    warm_fold_rmse,
+)
+
+INIT = {"qi": 900.0, "di": 0.2, "b": 0.5}
+
+
+def _series() -> tuple[np.ndarray, np.ndarray]:
+    t = np.linspace(0, 60, 200)
+    return t, simulate("arps_hyp", t, {"qi": 1000.0, "di": 0.1, "b": 0.7}, noise="gaussian", sigma=2.0, seed=0)
+
+
+def test_rolling_origin_splits_expand_and_stay_in_range() -> None:
+    splits = rolling_origin_splits(100, n_origins=10, horizon=6)
+    assert len(splits) == 10
+    assert [len(tr) for tr, _ in splits] == sorted(len(tr) for tr, _ in splits)
+    for tr, te in splits:
+        assert tr[0] == 0 and te[0] == tr[-1] + 1
+        assert len(te) == 6 and te[-1] < 100
+
+
+def test_warm_start_cv_matches_cold_with_fewer_evaluations() -> None:
+    t, q = _series()
+    splits = rolling_origin_splits(len(t), n_origins=24)
+    with profile() as cold_rec:
+        cold = [fold_rmse("arps_hyp", t, q, INIT, tr, te) for tr, te in splits]
+    with profile() as warm_rec:
+        warm = warm_fold_rmse("arps_hyp", t, q, INIT, splits)
+    assert warm == pytest.approx(cold, rel=1e-4)
+    assert warm_rec.stages["fit.least_squares"].counters["nfev"] < cold_rec.stages["fit.least_squares"].counters["nfev"]
+
+
+def test_capped_updates_and_cv_modes() -> None:
+    t, q = _series()
+    with profile() as rec:
+        errors = rolling_origin_rmse("arps_hyp", t, q, INIT, n_origins=30, update_nfev=2)
+    assert errors.shape == (30,)
+    assert rec.stages["fit.least_squares"].calls == 30
+    assert cv_rmse("arps_hyp", t, q, INIT, warm_start=True) == pytest.approx(cv_rmse("arps_hyp", t, q, INIT), rel=1e-4)